@@ -0,0 +1,300 @@
+"""
+File: AssetCache.py
+
+This module focuses on the AssetCache class, which follows the Singleton design pattern like the Settings class.
+Every sprite of the game loads its animation frames through the AssetCache so that each PNG is decoded and rescaled only once.
+The same Surface objects are then shared by every CharacterSprite, PlayerSprite and ObstalceSprite that asks for them:
+    "cache = AssetCache.get_cache()
+    frame = cache.get_frame('Python', 1, 0.93)"
+
+Rescaled frames are also kept on disk in Graphics/.cache as raw pixels, so that the next launch of the game
+does not have to decode the full-sized PNG and rescale it again. A cached file is only made again when its PNG changes.
+
+Every time an asset is loaded on the main thread, the functions in load_listeners are told what was loaded and how long it took.
+The HitchDetector uses this to know which loads happened during a slow frame.
+
+It also has the FontRegistry class, which does the same for fonts so that Settings and every TextSprite share one Font per size:
+    "font = FontRegistry.get_registry().get_font(FONT_PATH, 30)"
+"""
+
+import glob
+import hashlib
+import os
+import struct
+import time
+import pygame
+
+GRAPHICS_PATH = '/Users/jfv/Desktop/Serpent Sprint/Graphics'
+CACHE_PATH = f'{GRAPHICS_PATH}/.cache'
+FONT_PATH = '/Users/jfv/Desktop/Python Marathon/Graphics/Pokemon_GB.ttf'
+
+# The functions that are called with (kind, name, seconds) after an asset is loaded, such as HitchDetector.record_load()
+load_listeners = []
+
+def notify_load(kind, name, seconds):
+    for listener in load_listeners:
+        listener(kind, name, seconds)
+
+def scale_frame(frame, scale):
+    """
+    Returns the frame decreased by the percentage 'scale', the same way CharacterSprite.rescale_percentage() always did.
+    """
+    new_width = (frame.get_rect().width) * (1 - scale)
+    new_height = (frame.get_rect().height) * (1 - scale)
+    return pygame.transform.scale(frame, (new_width, new_height))
+
+def digest_file(path):
+    """
+    Returns the short hash of the file, which tells whether a PNG changed since a cached file or an atlas was made from it.
+    """
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()[:16]
+
+def remove_file(path):
+    """
+    Removes the file if it is still there. Another process, such as a worker of the BatchSimulator, may have removed it first.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class AssetCache():
+    """
+    The AssetCache class follows the Singleton design pattern since every sprite has to share the same decoded frames.
+
+    Attributes:
+        frames (dict): The cached Surfaces. The key is (name_image, index, scale) where scale is None for the original image.
+        masks (dict): The cached Masks of the frames for pixel-accurate collision. The key is the same as the frames.
+        atlases (dict): Whether the atlas of a (name_image, scale) was loaded. See load_atlas() of Sprite.py.
+        images (dict): The cached Surfaces of the other images, such as buttons and backgrounds. The key is the path of the image.
+        sounds (dict): The cached Sounds. The key is the path of the sound.
+        loader (AssetLoader): The AssetLoader that is loading assets in the background, if any.
+            If an asset is asked for while the loader is still loading it, the cache waits for the loader instead of loading it twice.
+        hits (int): The number of times a frame was found in the cache.
+        misses (int): The number of times a frame had to be loaded from disk or rescaled.
+        use_disk_cache (bool): True if rescaled frames are read from and written to CACHE_PATH.
+        disk_hits (int): The number of rescaled frames that were read from CACHE_PATH instead of being made from the PNG.
+        __instance (AssetCache): A class variable indicating whether an instance of the AssetCache class exists.
+
+    Methods:
+        get_cache(): Returns the instantiated AssetCache object. If it hasn't been created yet, it will create one. This is a static method.
+        get_frame(name_image, index, scale): Returns the frame, loading and rescaling it only if it is not cached yet.
+        get_mask(name_image, index, scale): Returns the Mask of the frame, computing it only if it is not cached yet.
+        read_frame(name_image, index, scale): Decodes a frame without converting it. This is safe to call from another thread.
+        read_scaled_frame(name_image, index, scale): Returns a rescaled frame from CACHE_PATH, making the cached file if needed.
+        get_image(path, has_alpha): Returns the image, loading it only if it is not cached yet.
+        get_sound(path): Returns the sound, loading it only if it is not cached yet.
+        stats(): Returns the hit and miss counters of the cache.
+        clear(): Removes every cached frame and resets the counters.
+    """
+
+    __instance = None
+
+    @staticmethod
+    def get_cache():
+        """
+        Returns an instance of the AssetCache class
+        """
+        if AssetCache.__instance is None:
+            AssetCache.__instance = AssetCache()
+        return AssetCache.__instance
+
+    def __init__(self):
+        if AssetCache.__instance is not None:
+            raise RuntimeError("AssetCache class is a singleton. There should only be one object of this kind.\nAssetCache class should be instantiated using get_cache()")
+
+        self.frames = {}
+        self.masks = {}
+        self.atlases = {}
+        self.images = {}
+        self.sounds = {}
+        self.loader = None
+        self.hits = 0
+        self.misses = 0
+        self.use_disk_cache = True
+        self.disk_hits = 0
+
+    def wait_for_loader(self, key):
+        """
+        wait_for_loader() is a helper method that finishes the asset of the key if the AssetLoader is still loading it.
+        """
+        if self.loader is not None and key in self.loader.pending:
+            self.loader.finish(key)
+
+    def get_frame(self, name_image, index, scale = None):
+        """
+        Returns the frame 'Graphics/{name_image}/{name_image}{index}.png'.
+
+        Args:
+            name_image (str): The name of the sprite, which is also the name of its folder inside Graphics
+            index (int): The number of the frame file
+            scale (float): The percent decrease used by rescale_percentage(). None returns the original image.
+        """
+        key = (name_image, index, scale)
+        self.wait_for_loader(key)
+        frame = self.frames.get(key)
+
+        if frame is not None:
+            self.hits += 1
+            return frame
+
+        self.misses += 1
+        start = time.perf_counter()
+        if scale is None or self.use_disk_cache:
+            frame = self.read_frame(name_image, index, scale).convert_alpha()
+        else:
+            # The rescaled frame is made from the cached original so that the PNG is still decoded only once
+            frame = scale_frame(self.get_frame(name_image, index), scale)
+
+        self.frames[key] = frame
+        notify_load('frame', f'{name_image}{index} {scale}', time.perf_counter() - start)
+        return frame
+
+    def read_frame(self, name_image, index, scale = None):
+        """
+        Returns the frame as it is decoded, without convert_alpha(). Since it does not use the display, 
+        the AssetLoader calls it from its threads and then converts the frame on the main thread.
+        """
+        if scale is None:
+            return pygame.image.load(f'{GRAPHICS_PATH}/{name_image}/{name_image}{str(index)}.png')
+        if self.use_disk_cache:
+            return self.read_scaled_frame(name_image, index, scale)
+        return scale_frame(pygame.image.load(f'{GRAPHICS_PATH}/{name_image}/{name_image}{str(index)}.png'), scale)
+
+    def read_scaled_frame(self, name_image, index, scale):
+        """
+        Returns the rescaled frame from its raw file in CACHE_PATH. The name of the file has the hash of the PNG,
+        so a changed PNG has a different file name and its frame is rescaled and saved again.
+        The raw file is a header with the width and height followed by the RGBA pixels from pygame.image.tobytes().
+        """
+        source_path = f'{GRAPHICS_PATH}/{name_image}/{name_image}{str(index)}.png'
+        digest = digest_file(source_path)
+        cache_path = f'{CACHE_PATH}/{name_image}{str(index)}_{scale}_{digest}.raw'
+
+        if os.path.isfile(cache_path):
+            with open(cache_path, 'rb') as file:
+                data = file.read()
+            # A file that was cut short, such as when the game was killed while writing it, is removed and made again
+            if len(data) >= 8:
+                width, height = struct.unpack('<II', data[:8])
+                if len(data) == 8 + width * height * 4:
+                    self.disk_hits += 1
+                    return pygame.image.frombytes(data[8:], (width, height), 'RGBA')
+            remove_file(cache_path)
+
+        frame = scale_frame(pygame.image.load(source_path), scale)
+
+        # Remove the files of older versions of the PNG before saving the new one
+        os.makedirs(CACHE_PATH, exist_ok=True)
+        for old_path in glob.glob(f'{glob.escape(CACHE_PATH)}/{glob.escape(name_image + str(index))}_{glob.escape(str(scale))}_*.raw'):
+            remove_file(old_path)
+
+        # The file is written under a temporary name and then renamed, so no other process ever reads half of it
+        temporary_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as file:
+            file.write(struct.pack('<II', frame.get_width(), frame.get_height()))
+            file.write(pygame.image.tobytes(frame, 'RGBA'))
+        os.replace(temporary_path, cache_path)
+        return frame
+
+    def get_image(self, path, has_alpha = True):
+        self.wait_for_loader(path)
+        image = self.images.get(path)
+
+        if image is None:
+            start = time.perf_counter()
+            image = pygame.image.load(path)
+            image = image.convert_alpha() if has_alpha else image.convert()
+            self.images[path] = image
+            notify_load('image', path, time.perf_counter() - start)
+        return image
+
+    def get_sound(self, path):
+        self.wait_for_loader(path)
+        sound = self.sounds.get(path)
+
+        if sound is None:
+            start = time.perf_counter()
+            sound = pygame.mixer.Sound(path)
+            self.sounds[path] = sound
+            notify_load('sound', path, time.perf_counter() - start)
+        return sound
+
+    def get_mask(self, name_image, index, scale = None):
+        """
+        Returns the Mask of the frame. It is computed once from the cached frame and then shared like the frames.
+        """
+        key = (name_image, index, scale)
+        mask = self.masks.get(key)
+
+        if mask is None:
+            mask = pygame.mask.from_surface(self.get_frame(name_image, index, scale))
+            self.masks[key] = mask
+        return mask
+
+    def stats(self):
+        """
+        Returns the counters of the cache as a dictionary
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'disk_hits': self.disk_hits, 'frames': len(self.frames)}
+
+    def clear(self):
+        """
+        Removes every cached frame. This is needed if the display is recreated since convert_alpha() depends on it.
+        """
+        self.frames.clear()
+        self.masks.clear()
+        self.atlases.clear()
+        self.images.clear()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+class FontRegistry():
+    """
+    The FontRegistry class follows the Singleton design pattern since every text of the game has to share the same fonts.
+
+    Attributes:
+        fonts (dict): The loaded fonts. The key is (path, size).
+        __instance (FontRegistry): A class variable indicating whether an instance of the FontRegistry class exists.
+
+    Methods:
+        get_registry(): Returns the instantiated FontRegistry object. If it hasn't been created yet, it will create one. This is a static method.
+        get_font(path, size): Returns the font, opening the font file only if it is not loaded yet.
+        preload(path, sizes): Loads the font in every given size, so that no font file is opened while the game is running.
+    """
+
+    __instance = None
+
+    @staticmethod
+    def get_registry():
+        """
+        Returns an instance of the FontRegistry class
+        """
+        if FontRegistry.__instance is None:
+            FontRegistry.__instance = FontRegistry()
+        return FontRegistry.__instance
+
+    def __init__(self):
+        if FontRegistry.__instance is not None:
+            raise RuntimeError("FontRegistry class is a singleton. There should only be one object of this kind.\nFontRegistry class should be instantiated using get_registry()")
+
+        self.fonts = {}
+
+    def get_font(self, path = FONT_PATH, size = 30):
+        key = (path, size)
+        font = self.fonts.get(key)
+
+        if font is None:
+            start = time.perf_counter()
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(path, size)
+            self.fonts[key] = font
+            notify_load('font', f'{path} {size}', time.perf_counter() - start)
+        return font
+
+    def preload(self, path = FONT_PATH, sizes = (30,)):
+        for size in sizes:
+            self.get_font(path, size)
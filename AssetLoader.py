@@ -0,0 +1,170 @@
+"""
+File: AssetLoader.py
+
+This module focuses on the AssetLoader class. Decoding PNGs and sounds takes long enough to freeze the screen,
+so the AssetLoader decodes them on a pool of threads while the introduction and loading screens keep running.
+Only decoding is done on the threads. convert() and convert_alpha() need the display, so they are done on the main thread
+by process(), which the scenes call once per frame:
+    "loader = AssetLoader()
+    loader.preload_frames('Python', range(1, 3), 0.93)
+    loader.process()
+    loader.progress()"
+
+Every asset ends up in the AssetCache, so the sprites load them like before with get_frame(), get_image() and get_sound().
+If a sprite asks for an asset that is still being loaded, the AssetCache waits for its future instead of loading it a second time.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+import time
+from AssetCache import AssetCache, notify_load
+from Atlas import atlas_name, read_index
+
+class AssetLoader():
+    """
+    The AssetLoader decodes assets on a thread pool and puts them in the AssetCache on the main thread.
+
+    Attributes:
+        executor (ThreadPoolExecutor): The threads that decode the assets.
+        pending (dict): The assets that are not in the AssetCache yet. The key is the key of the asset in the AssetCache
+            and the value is the future of the decoding and the function that puts the decoded asset in the AssetCache.
+        total (int): The number of assets that were submitted.
+        finished (int): The number of assets that are already in the AssetCache.
+
+    Methods:
+        submit(key, load, finish): Decodes an asset with load() on a thread. finish() is later called on the main thread with the result.
+        preload_frames(name_image, frame_numbers, scale): Loads the frames of a sprite, or its atlas if Atlas.py made one.
+        preload_image(path, has_alpha): Loads an image such as a button or a background.
+        preload_sound(path): Loads a sound.
+        process(): Puts every asset that is done decoding in the AssetCache. This is called once per frame on the main thread.
+        finish(key): Waits for one asset and puts it in the AssetCache.
+        wait(): Waits for every asset.
+        progress(): Returns the fraction of the assets that are in the AssetCache.
+        is_done(): Returns True if every asset is in the AssetCache.
+    """
+    def __init__(self, max_workers = 4):
+        self.executor = ThreadPoolExecutor(max_workers = max_workers)
+        self.pending = {}
+        self.total = 0
+        self.finished = 0
+        AssetCache.get_cache().loader = self
+
+    def submit(self, key, load, finish):
+        if key in self.pending:
+            return
+        self.pending[key] = (self.executor.submit(load), finish)
+        self.total += 1
+
+    def preload_frames(self, name_image, frame_numbers, scale = None):
+        cache = AssetCache.get_cache()
+        key = (name_image, scale)
+        if scale is not None and cache.atlases.get(key) is not False and os.path.isfile(atlas_name(name_image, scale) + '.json'):
+            if key not in cache.atlases:
+                self.submit(key, lambda: self.read_atlas(name_image, frame_numbers, scale), self.finish_atlas)
+            return
+
+        for number in frame_numbers:
+            key = (name_image, number, scale)
+            if key not in cache.frames:
+                self.submit(key,
+                            lambda number = number: cache.read_frame(name_image, number, scale),
+                            lambda frame, key = key: cache.frames.__setitem__(key, frame.convert_alpha()))
+
+    def read_atlas(self, name_image, frame_numbers, scale):
+        """
+        read_atlas() is a helper method that decodes the atlas and its index on a thread, like load_atlas() of Sprite.py.
+        The atlas is not decoded if it is older than its PNGs.
+        """
+        index = read_index(name_image, scale)
+        if index is None:
+            return name_image, frame_numbers, scale, None, None
+        return name_image, frame_numbers, scale, index, pygame.image.load(atlas_name(name_image, scale) + '.png')
+
+    def finish_atlas(self, result):
+        name_image, frame_numbers, scale, index, atlas = result
+        cache = AssetCache.get_cache()
+
+        # An atlas older than its PNGs is not used, so the frames are loaded one by one instead
+        if index is None:
+            cache.atlases[(name_image, scale)] = False
+            self.preload_frames(name_image, frame_numbers, scale)
+            return
+
+        atlas = atlas.convert_alpha()
+        for number, rect in index['frames'].items():
+            cache.frames[(name_image, int(number), scale)] = atlas.subsurface(rect)
+        cache.atlases[(name_image, scale)] = True
+
+    def preload_image(self, path, has_alpha = True):
+        cache = AssetCache.get_cache()
+        if path in cache.images:
+            return
+
+        def finish(image):
+            cache.images[path] = image.convert_alpha() if has_alpha else image.convert()
+        self.submit(path, lambda: pygame.image.load(path), finish)
+
+    def preload_sound(self, path):
+        cache = AssetCache.get_cache()
+        if path not in cache.sounds:
+            self.submit(path, lambda: pygame.mixer.Sound(path), lambda sound: cache.sounds.__setitem__(path, sound))
+
+    def finish(self, key):
+        # Only the waiting and the converting on the main thread are told to the load_listeners
+        start = time.perf_counter()
+        future, finish = self.pending.pop(key)
+        finish(future.result())
+        self.finished += 1
+        notify_load('loader', str(key), time.perf_counter() - start)
+
+    def process(self):
+        for key in [key for key, (future, finish) in self.pending.items() if future.done()]:
+            self.finish(key)
+
+    def wait(self):
+        # Finishing an atlas that is older than its PNGs submits its frames, so the loop runs until nothing is left
+        while self.pending:
+            self.finish(next(iter(self.pending)))
+
+    def progress(self):
+        if self.total == 0:
+            return 1
+        return self.finished / self.total
+
+    def is_done(self):
+        return not self.pending
+
+# This is to compare loading the frames of every character one by one with loading them on the threads.
+if __name__ == "__main__":
+    import time
+    from Settings import Settings
+    from Atlas import ATLAS_CHARACTERS
+
+    game = Settings.get_settings()
+    game.start_game()
+    cache = AssetCache.get_cache()
+    cache.use_disk_cache = False
+
+    start = time.perf_counter()
+    for name_image, number_files, scale in ATLAS_CHARACTERS:
+        for number in range(1, number_files + 1):
+            cache.read_frame(name_image, number, scale).convert_alpha()
+    print(f"One by one: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    loader = AssetLoader()
+    for name_image, number_files, scale in ATLAS_CHARACTERS:
+        for number in range(1, number_files + 1):
+            key = (name_image, number, scale)
+            loader.submit(key,
+                          lambda name_image = name_image, number = number, scale = scale: cache.read_frame(name_image, number, scale),
+                          lambda frame, key = key: cache.frames.__setitem__(key, frame.convert_alpha()))
+
+    # The main thread keeps running frames while the threads decode
+    frames = 0
+    while not loader.is_done():
+        loader.process()
+        frames += 1
+        time.sleep(0.001)
+    print(f"Threads: {(time.perf_counter() - start) * 1000:.1f} ms, {frames} frames while loading, progress {loader.progress():.0%}")
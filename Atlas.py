@@ -0,0 +1,94 @@
+"""
+File: Atlas.py
+
+This module is the build step for the texture atlases of the game. Instead of opening and decoding a PNG for every frame,
+all frames of a character are pre-scaled and packed into one atlas image with an index file that says where every frame is:
+    Graphics/Atlas/Frog_0.85.png
+    Graphics/Atlas/Frog_0.85.json
+
+The atlases are built by running this module once after the graphics change:
+    "python Atlas.py"
+load_atlas() in Sprite.py then slices the frames out of the atlas as subsurfaces.
+The index also has the hash of every PNG the atlas was made from. If a PNG was changed and the atlas was not built again,
+read_index() returns None and the frames are loaded one by one instead of showing the old frames.
+"""
+
+import json
+import os
+import pygame
+from AssetCache import GRAPHICS_PATH, scale_frame, digest_file
+
+ATLAS_PATH = f'{GRAPHICS_PATH}/Atlas'
+
+# The characters of the game as (name_image, number of frame files, scale used in Game.py)
+ATLAS_CHARACTERS = [('Frog', 4, 0.85),
+                    ('Rabbit', 4, 0.85),
+                    ('Chick', 6, 0.91),
+                    ('LetterBird', 14, 0.3),
+                    ('Python', 2, 0.93)]
+
+def atlas_name(name_image, scale):
+    return f'{ATLAS_PATH}/{name_image}_{scale}'
+
+def frame_path(name_image, number):
+    return f'{GRAPHICS_PATH}/{name_image}/{name_image}{str(number)}.png'
+
+def read_index(name_image, scale):
+    """
+    Returns the index of the atlas, or None if there is no atlas or one of its PNGs changed since the atlas was built.
+    """
+    if scale is None or not os.path.isfile(atlas_name(name_image, scale) + '.json'):
+        return None
+    with open(atlas_name(name_image, scale) + '.json') as file:
+        index = json.load(file)
+
+    digests = index.get('digests', {})
+    for number in index['frames']:
+        path = frame_path(name_image, number)
+        if not os.path.isfile(path) or digests.get(number) != digest_file(path):
+            return None
+    return index
+
+def build_atlas(name_image, number_files, scale, max_width = 2048):
+    """
+    Scales every frame of the character and packs them in rows into one atlas image.
+
+    Args:
+        name_image (str): The name of the character, which is also the name of its folder inside Graphics
+        number_files (int): The number of frame files of the character
+        scale (float): The percent decrease of rescale_percentage()
+        max_width (int): The width in pixels after which the next frames are put in a new row
+    """
+    frames = {}
+    digests = {}
+    for number in range(1, number_files + 1):
+        frames[number] = scale_frame(pygame.image.load(frame_path(name_image, number)), scale)
+        digests[number] = digest_file(frame_path(name_image, number))
+
+    # Put the frames next to each other and start a new row when the row is full
+    positions = {}
+    location_x, location_y, row_height, width = 0, 0, 0, 0
+    for number, frame in frames.items():
+        if location_x > 0 and location_x + frame.get_width() > max_width:
+            location_x = 0
+            location_y += row_height
+            row_height = 0
+        positions[number] = [location_x, location_y, frame.get_width(), frame.get_height()]
+        location_x += frame.get_width()
+        row_height = max(row_height, frame.get_height())
+        width = max(width, location_x)
+
+    atlas = pygame.Surface((width, location_y + row_height), pygame.SRCALPHA)
+    for number, frame in frames.items():
+        atlas.blit(frame, positions[number][:2])
+
+    os.makedirs(ATLAS_PATH, exist_ok=True)
+    pygame.image.save(atlas, atlas_name(name_image, scale) + '.png')
+    with open(atlas_name(name_image, scale) + '.json', 'w') as file:
+        json.dump({'name_image': name_image, 'scale': scale, 'frames': positions, 'digests': digests}, file)
+
+# This builds the atlas of every character of the game.
+if __name__ == "__main__":
+    for name_image, number_files, scale in ATLAS_CHARACTERS:
+        build_atlas(name_image, number_files, scale)
+        print(f"Built {atlas_name(name_image, scale)}.png")
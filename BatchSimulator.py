@@ -0,0 +1,100 @@
+"""
+File: BatchSimulator.py
+
+This module runs many headless games in parallel to balance the modes without having to play them by hand.
+Every game is one run of run_headless() of GameCore.py in one of the processes of a ProcessPoolExecutor.
+A run is given its own seed for Settings.rng, so the same seed always gives the same game:
+    "results = run_batch(['Easy', 'Hard'], runs = 200)
+    report = make_report(results)"
+
+The player of every game either follows a script of arrow keys or is the DodgeBot of Input.py.
+The number of pythons and the velocities of the pythons can be changed for a whole batch to see how they change the game.
+The report has the score, the survival time and the hits of every mode.
+"""
+
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from Input import UP, DOWN
+
+# The player of a run moves up and down across the screen unless another script is given
+SWEEP_SCRIPT = [UP] * 30 + [DOWN] * 30
+
+def simulate(mode, seed, max_ticks = 30000, script = SWEEP_SCRIPT, use_bot = False, number_pythons = None, velocity_range = None):
+    """
+    Plays one headless game and returns its result. This runs inside the processes of the ProcessPoolExecutor,
+    where pygame is started with the dummy drivers the first time a game is played.
+
+    Args:
+        mode (str): The mode of the game, which is a key of MODES.
+        seed (int): The seed of the random numbers of the game.
+        max_ticks (int): The largest number of simulation steps of the game.
+        script (list): The bitmasks of the arrow keys of the player. The script is repeated until the game ends.
+        use_bot (bool): True if the player is the DodgeBot instead of the script.
+        number_pythons (int): The number of pythons, or None for the number of the mode.
+        velocity_range (tuple): The smallest and largest velocity of the pythons, or None for the velocities of the game.
+    """
+    from Settings import Settings
+    from Sprite import obstacle_pool
+    from GameCore import run_headless
+    from Input import ScriptedInput, DodgeBot
+
+    if velocity_range is not None:
+        obstacle_pool.velocity_range = velocity_range
+
+    start = time.perf_counter()
+    input_source = DodgeBot() if use_bot else ScriptedInput(script, is_repeating = True)
+    result = run_headless(mode, input_source, max_ticks, number_pythons, seed)
+    result['seed'] = seed
+    result['survival_time'] = result['ticks'] / Settings.get_settings().tick_rate
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def run_batch(modes, runs = 100, first_seed = 0, max_workers = None, **options):
+    """
+    Plays runs games of every mode on all the cores. The seeds are first_seed, first_seed + 1 and so on for every mode.
+    The other keyword arguments are passed to simulate(). Returns the results of every game.
+    """
+    jobs = [(mode, first_seed + run) for mode in modes for run in range(runs)]
+    with ProcessPoolExecutor(max_workers = max_workers) as executor:
+        futures = [executor.submit(simulate, mode, seed, **options) for mode, seed in jobs]
+        return [future.result() for future in futures]
+
+def summarize(values):
+    """
+    summarize() is a helper function that returns the mean, median, minimum and maximum of the values.
+    """
+    return {'mean': statistics.mean(values),
+            'median': statistics.median(values),
+            'min': min(values),
+            'max': max(values)}
+
+def make_report(results):
+    """
+    Returns a dictionary with the statistics of the score, survival time and hits of every mode.
+    """
+    report = {}
+    for mode in dict.fromkeys(result['mode'] for result in results):
+        mode_results = [result for result in results if result['mode'] == mode]
+        report[mode] = {'runs': len(mode_results),
+                        'score': summarize([result['score'] for result in mode_results]),
+                        'survival_time': summarize([result['survival_time'] for result in mode_results]),
+                        'hits': summarize([result['hits'] for result in mode_results])}
+    return report
+
+# This balances every mode with 100 games each and prints the report.
+if __name__ == "__main__":
+    from GameCore import MODES
+
+    start = time.perf_counter()
+    results = run_batch(list(MODES), runs = 100)
+    seconds = time.perf_counter() - start
+
+    print(f"{'mode':>7} {'score':>16} {'survival (s)':>18} {'hits':>6}")
+    for mode, report in make_report(results).items():
+        score = report['score']
+        survival_time = report['survival_time']
+        print(f"{mode:>7} {score['mean']:>7.1f} ({score['min']}-{score['max']})"
+              f" {survival_time['mean']:>8.1f} ({survival_time['min']:.0f}-{survival_time['max']:.0f})"
+              f" {report['hits']['mean']:>6.1f}")
+    print(f"{len(results)} games in {seconds:.1f} s, {sum(result['ticks'] for result in results) / seconds:.0f} ticks per second")
@@ -0,0 +1,177 @@
+"""
+File: Collision.py
+
+This module focuses on the SpatialHash class. pygame.sprite.spritecollide() checks the player against every python,
+so the cost of collision grows with the number of pythons. The SpatialHash divides the screen into a uniform grid
+and remembers which cells every python is in, so the player only has to be checked against the pythons near it:
+    "spatial_hash = SpatialHash()
+    spatial_hash.insert(obstacle)
+    collisions = spatial_hash.collide(player, dokill = True)"
+
+The cells of a python are updated by CharacterSprite.step() every time its strategy moves it.
+"""
+
+import pygame
+
+def collide_rect_mask(sprite, other):
+    """
+    Pixel-accurate collision of two sprites. The rectangles are checked first, so the masks are only compared
+    when the rectangles already collide. The masks are the ones cached by CharacterSprite.rescale_percentage().
+    """
+    return sprite.rect.colliderect(other.rect) and pygame.sprite.collide_mask(sprite, other) is not None
+
+class SpatialHash():
+    """
+    SpatialHash is a uniform grid over the sprites for the broad phase of the collision detection.
+
+    Attributes:
+        cell_size (int): The width and height of every cell in pixels. It should be about the size of a python.
+        cells (dict): The sprites in every cell. The key is the (column, row) of the cell.
+        sprite_cells (dict): The range of cells (first column, first row, last column, last row) that every sprite is in.
+
+    Methods:
+        insert(sprite): Adds a sprite to the cells its rect overlaps.
+        remove(sprite): Removes a sprite from its cells.
+        move(sprite): Updates the cells of a sprite after its rect moved. Nothing is done if it is still in the same cells.
+        query(rect): Returns the sprites in the cells that the rect overlaps.
+        collide(sprite, dokill, collided): Returns the sprites that collide with the sprite, like pygame.sprite.spritecollide().
+    """
+    def __init__(self, cell_size = 128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.sprite_cells = {}
+
+    def __len__(self):
+        return len(self.sprite_cells)
+
+    def cell_range(self, rect):
+        """
+        cell_range() is a helper method that returns the first and last column and row that the rect overlaps.
+        """
+        return (rect.left // self.cell_size,
+                rect.top // self.cell_size,
+                (rect.right - 1) // self.cell_size,
+                (rect.bottom - 1) // self.cell_size)
+
+    def add_to_cells(self, sprite, cell_range):
+        first_column, first_row, last_column, last_row = cell_range
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                # A dictionary is used instead of a set so that the order of the sprites is always the same
+                self.cells.setdefault((column, row), {})[sprite] = None
+
+    def remove_from_cells(self, sprite, cell_range):
+        first_column, first_row, last_column, last_row = cell_range
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                cell = self.cells.get((column, row))
+                if cell is not None:
+                    cell.pop(sprite, None)
+                    if not cell:
+                        del self.cells[(column, row)]
+
+    def insert(self, sprite):
+        cell_range = self.cell_range(sprite.rect)
+        self.add_to_cells(sprite, cell_range)
+        self.sprite_cells[sprite] = cell_range
+        sprite.spatial_hash = self
+
+    def remove(self, sprite):
+        cell_range = self.sprite_cells.pop(sprite, None)
+        if cell_range is not None:
+            self.remove_from_cells(sprite, cell_range)
+        sprite.spatial_hash = None
+
+    def move(self, sprite):
+        old_range = self.sprite_cells[sprite]
+        new_range = self.cell_range(sprite.rect)
+
+        # Most of the time a sprite stays in the same cells, so nothing has to be done
+        if new_range == old_range:
+            return
+
+        self.remove_from_cells(sprite, old_range)
+        self.add_to_cells(sprite, new_range)
+        self.sprite_cells[sprite] = new_range
+
+    def query(self, rect):
+        first_column, first_row, last_column, last_row = self.cell_range(rect)
+        found = {}
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                cell = self.cells.get((column, row))
+                if cell:
+                    found.update(cell)
+        return list(found)
+
+    def collide(self, sprite, dokill = False, collided = None):
+        """
+        Returns the list of sprites that collide with the given sprite.
+
+        Args:
+            sprite (Sprite): The sprite to check, which is usually the player.
+            dokill (bool): True if the collided sprites should be removed from the grid and killed.
+            collided (function): An optional narrow phase such as pygame.sprite.collide_mask. It is only called after the rectangles collide.
+        """
+        collisions = [other for other in self.query(sprite.rect)
+                      if sprite.rect.colliderect(other.rect) and (collided is None or collided(sprite, other))]
+
+        if dokill:
+            for other in collisions:
+                self.remove(other)
+                other.kill()
+        return collisions
+
+# This is to compare the SpatialHash with pygame.sprite.spritecollide() for different numbers of pythons.
+# It does not need a display since it only uses rectangles.
+if __name__ == "__main__":
+    import random
+    import time
+
+    def make_sprites(number, group):
+        sprites = []
+        for _ in range(number):
+            sprite = pygame.sprite.Sprite(group)
+            sprite.rect = pygame.Rect(random.randint(0, 1120), random.randint(0, 700), 108, 92)
+            sprites.append(sprite)
+        return sprites
+
+    random.seed(0)
+    player = pygame.sprite.Sprite()
+    player.rect = pygame.Rect(0, 350, 100, 100)
+    frames = 300
+
+    print(f"{'pythons':>8} {'spritecollide':>14} {'hash query':>11} {'hash update':>12} {'hash total':>11}   (ms per frame)")
+    for number in [10, 100, 1000, 10000]:
+        group = pygame.sprite.Group()
+        sprites = make_sprites(number, group)
+        spatial_hash = SpatialHash()
+        for sprite in sprites:
+            spatial_hash.insert(sprite)
+
+        start = time.perf_counter()
+        for frame in range(frames):
+            pygame.sprite.spritecollide(player, group, False)
+        time_group = (time.perf_counter() - start) / frames * 1000
+
+        start = time.perf_counter()
+        for frame in range(frames):
+            spatial_hash.collide(player)
+        time_query = (time.perf_counter() - start) / frames * 1000
+
+        # Every frame the pythons move to the left and the grid is updated incrementally.
+        # The moving itself costs the same without the grid, so it is measured alone and taken out.
+        start = time.perf_counter()
+        for frame in range(frames):
+            for sprite in sprites:
+                sprite.rect.x = (sprite.rect.x - 4) % 1120
+                spatial_hash.move(sprite)
+        time_update = (time.perf_counter() - start) / frames * 1000
+
+        start = time.perf_counter()
+        for frame in range(frames):
+            for sprite in sprites:
+                sprite.rect.x = (sprite.rect.x - 4) % 1120
+        time_update -= (time.perf_counter() - start) / frames * 1000
+
+        print(f"{number:>8} {time_group:>14.4f} {time_query:>11.4f} {time_update:>12.4f} {time_query + time_update:>11.4f}")
@@ -4,396 +4,386 @@ File: Game.py
 This module focuses on the creating the game.
 This module contains the code to play the game. It imports all previous modules to combine and use them so that 
 it can leverage pre-existing functionality and organize the game logic in a modular and efficient manner.
+The game is started by main(), so it can also be started and wrapped from another module:
+    "from Game import main
+    main()"
 
 Creator: John Francis Y. Viray and Farell Alastair T. Lu
 """
 
 import pygame
+import random
 import sys
 from Settings import Settings
 from TextSprite import TextSprite, ButtonSprite, TextSpriteWhite
+from Scene import IntroductionScene, DifficultyScene, LoadingScene
+from AssetCache import AssetCache
+from AssetLoader import AssetLoader
+from Renderer import DirtyRectRenderer
+from GameCore import GameCore, MODES
+from Input import DodgeBot, KeyboardInput
+from Replay import RecordingInput, save_replay
+from Profiler import FrameProfiler
+from HitchDetector import HitchDetector
+from RuntimeProfiler import RuntimeProfiler
 from Sprite import *
 
+SCENES = {'introduction': IntroductionScene,
+          'difficulty': DifficultyScene,
+          'loading': LoadingScene}
+
 class GameState():
-    def __init__(self):
+    def __init__(self, runtime_profiler = None):
+        game = Settings.get_settings()
+
+        # Every frame that is much slower than 1/fps is written down with what was loaded during it
+        self.hitches = HitchDetector(game.fps, game.hitch_budget_factor, game.hitch_log_path) if game.use_hitch_detector else None
+
+        # SERPENT_PROFILE or F4 runs cProfile and the sampling profiler around the states that are asked for
+        self.runtime_profiler = runtime_profiler if runtime_profiler is not None else RuntimeProfiler.from_environment()
+
         self.state = 'introduction'
         self.mode = ''
         self.game = Settings.get_settings()
         self.game.start_game()
         self.player = None
+        self.core = None
         self.background_image = None
         self.number_pythons = 3
+        self.scenes = {}
+
+        # The assets that every mode needs are decoded on threads while the player types in their name
+        self.loader = AssetLoader()
+        for name_button in ['Introduction', 'Easy', 'Medium', 'Hard', 'StoryMode', 'PythonMarathonTitle', 'End']:
+            self.loader.preload_image(f'/Users/jfv/Desktop/Serpent Sprint/Graphics/Button/{name_button}.png')
+        self.loader.preload_sound("/Users/jfv/Desktop/Serpent Sprint/Sound/Starting Game.mp3")
+        self.loader.preload_sound("/Users/jfv/Desktop/Python Marathon/Sound/Starting Game.mp3")
+        self.loader.preload_frames('Python', range(1, 3), 0.93)
+
+    def preload_mode(self):
+        """
+        Queues the character and background of the chosen mode on the AssetLoader. The LoadingScene waits for them.
+        """
+        mode = MODES[self.mode]
+        preload_character(self.loader, mode['character'])
+        self.loader.preload_image(f"/Users/jfv/Desktop/Serpent Sprint/Graphics/Background/{mode['background']}.png", has_alpha = False)
+        if self.mode == 'Story':
+            self.loader.preload_frames('LetterBird', range(1, 8))
+            self.loader.preload_image('/Users/jfv/Desktop/Serpent Sprint/Graphics/Button/Letter.png')
     
-    def introduction(self):
-        all_group = pygame.sprite.Group()
-        game = Settings.get_settings()
+    def get_scene(self, state):
+        """
+        Returns the Scene of the given state. The scene is only built the first time the state is entered.
+        """
+        if state not in self.scenes:
+            self.scenes[state] = SCENES[state](self)
+        return self.scenes[state]
 
-        starting_sound = pygame.mixer.Sound("/Users/jfv/Desktop/Serpent Sprint/Sound/Starting Game.mp3")
-        
-        introduction_screen = ButtonSprite(name_image="Introduction",
-                                           location_x=0,
-                                           location_y=0,
-                                           groups=(all_group))
-
-        name = TextSprite(name_image= f"Name: {game.name}",
-                          location_x=351,
-                          location_y=424,
-                          groups=(all_group))
-        
+    def introduction(self):
+        self.get_scene('introduction').run()
+    
+    def choose_difficulty(self):
+        self.get_scene('difficulty').run()
+
+    def load(self):
+        self.get_scene('loading').run()
+
+    def end_frame(self, state):
+        """
+        Called after every FrameScheduler.tick() with the state of the game during the frame.
+        """
+        if self.hitches is not None:
+            self.hitches.end_frame(self.game.scheduler.frame_time, state)
+        self.runtime_profiler.set_state(state)
+
+def run_introduction(states):
+    """
+    Runs the introduction, the choice of the difficulty and the loading screen until the game starts.
+    Returns True if the chosen mode is the story.
+    """
+    game = states.game
+    is_story_running = False
+    is_intro_running = True
+    while is_intro_running:
+        if states.state == 'introduction':
+            states.introduction()
+        if states.state == 'difficulty':
+            states.choose_difficulty()
+        if states.state == 'loading':
+            states.load()
+        if states.state == 'game': 
+            # The LoadingScene already waited for the loader, so wait() only makes sure nothing is still being decoded.
+            states.loader.wait()
+            mode = MODES[states.mode]
+            states.background_image = AssetCache.get_cache().get_image(f"/Users/jfv/Desktop/Serpent Sprint/Graphics/Background/{mode['background']}.png", has_alpha = False)
+            states.number_pythons = mode['number_pythons']
+            Settings.get_settings().mode = states.mode
+            if states.mode == 'Story':
+                print('went through')
+                is_story_running = True
+            is_intro_running = False
+        game.scheduler.tick()
+        states.end_frame(states.state)
+    return is_story_running
+
+def run_story(states):
+    """
+    Runs the letter bird and the letter of the story until the player presses Enter twice.
+    """
+    game = states.game
+    story_group = pygame.sprite.Group()
+    letter_bird = ObstalceSprite(name_image='LetterBird',
+                                    number_frames=7,
+                                    location_x= 461,
+                                    location_y= 256,
+                                    strategy_pattern=BirdUpdating,
+                                    groups=(story_group),
+                                    framespeed=0.2)
+
+    delivery_text = TextSprite(name_image=f"Tweet tweet!! Delivery for {game.name}!!",
+                              location_x=game.width_screen,
+                              location_y=150,
+                              groups=(story_group))
+    instructional_text = TextSprite(name_image=f"Press Enter to open it!!",
+                              location_x=game.width_screen,
+                              location_y=200,
+                              groups=(story_group))
+
+    delivery_text.draw_middle()
+    instructional_text.draw_middle()
+
+    is_story_running = True
+    is_story_running_2 = False
+    while is_story_running:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_BACKSPACE and len(game.name) > 0:
-                    game.name = game.name[:-1]
-                elif event.key == pygame.K_RETURN and game.name != "":
-                    self.state = 'difficulty'
-                    starting_sound.play()
-                else:
-                    if event.unicode.isprintable() and len(game.name) < 8:
-                        game.name += event.unicode
+                if event.key == pygame.K_RETURN:
+                    states.state = 'game'
+                    states.state = 'Story'
+                    is_story_running = False
+                    is_story_running_2 = True
 
         game.screen.fill('white')
-        all_group.draw(Settings.get_settings().screen)
-        all_group.update()
+        story_group.draw(game.screen)
+        story_group.update()
         pygame.display.update()
-    
-    def choose_difficulty(self):
-        all_group = pygame.sprite.Group()
-        game = Settings.get_settings()
-
-        starting_sound = pygame.mixer.Sound("/Users/jfv/Desktop/Python Marathon/Sound/Starting Game.mp3")
+        game.scheduler.tick()
+        states.end_frame('story')
 
-        easy_button = ButtonSprite(name_image='Easy',
-                                   location_x=80,
-                                   location_y=160,
-                                   groups=(all_group))
+    story2_group = pygame.sprite.Group()
+    letter2 = ButtonSprite(name_image='Letter',
+                           location_x=0,
+                           location_y=0,
+                           groups = (story2_group))
 
-        medium_button = ButtonSprite(name_image='Medium',
-                                   location_x=80,
-                                   location_y=314,
-                                   groups=(all_group))
-        
-        hard_button = ButtonSprite(name_image='Hard',
-                                   location_x=80,
-                                   location_y=468,
-                                   groups=(all_group))
-
-        story_button = ButtonSprite(name_image='StoryMode',
-                                   location_x=789,
-                                   location_y=160,
-                                   groups=(all_group))
-        
-        difficulty_text = TextSprite(name_image="C H O O S E  D I F F I C U L T Y",
-                                     location_x=80, 
-                                     location_y=70,
-                                     groups=(all_group))
-        
+    while is_story_running_2:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if easy_button.is_clicked(event):
-                    self.mode = 'Easy'
-                    self.state = 'game'
-                    print(True)
-                    
-                if medium_button.is_clicked(event):
-                    self.mode = 'Medium'
-                    self.state = 'game'
-                
-                if hard_button.is_clicked(event):
-                    self.mode = 'Hard'
-                    self.state = 'game'
-                
-                if story_button.is_clicked(event):
-                    self.mode = 'Story'
-                    self.state = 'game'
-                
-                starting_sound.play()
-            
-            game.screen.fill((255, 255, 255))
-            all_group.draw(game.screen)
-            all_group.update()
-            pygame.display.update()
-
-
-states = GameState()
-game = Settings.get_settings()
-obstaclesprites = pygame.sprite.Group()
-textsprites = pygame.sprite.Group()
-allsprites = pygame.sprite.Group()
-player_group = pygame.sprite.Group()
-story_group = pygame.sprite.Group()
-
-# These are the sprites that will be displayed on the screen.
-frog = PlayerSprite(name_image = 'Frog', 
-                number_frames = 2,
-                location_x = 0,
-                location_y = 350, 
-                strategy_pattern = PlayerUpdating, 
-                groups = (player_group),
-                velocity = 6,
-                is_facing_left = False, 
-                framespeed = 0.1)
-frog.rescale_percentage(0.85)
-
-rabbit = PlayerSprite(name_image = 'Rabbit', 
-                number_frames = 2,
-                location_x = 0,
-                location_y = 350, 
-                strategy_pattern = PlayerUpdating, 
-                groups = (player_group),
-                velocity = 9,
-                is_facing_left = False, 
-                framespeed = 0.1)
-rabbit.rescale_percentage(0.85)
-
-chick = PlayerSprite(name_image = 'Chick', 
-                number_frames = 3,
-                location_x = 0,
-                location_y = 350, 
-                strategy_pattern = PlayerUpdating, 
-                groups = (player_group),
-                velocity = 4,
-                is_facing_left = False, 
-                framespeed = 0.1)
-chick.rescale_percentage(0.91)
-
-bird = PlayerSprite(name_image = 'LetterBird', 
-                number_frames = 7,
-                location_x = 0,
-                location_y = 350, 
-                strategy_pattern = PlayerUpdating, 
-                groups = (player_group),
-                velocity = 3,
-                is_facing_left = False, 
-                framespeed = 0.1)
-bird.rescale_percentage(0.3)
-
-
-players = [frog, rabbit, chick, bird]
-game = Settings.get_settings()
-letter_bird = ObstalceSprite(name_image='LetterBird',
-                                number_frames=7,
-                                location_x= 461,
-                                location_y= 256,
-                                strategy_pattern=BirdUpdating,
-                                groups=(story_group),
-                                framespeed=0.2)
-
-is_paused = False
-is_game_over = False
-is_intro_running = True
-is_story_running = False
-is_story_running_2 = False
-
-while is_intro_running:
-    if states.state == 'introduction':
-        states.introduction()
-    if states.state == 'difficulty':
-        states.choose_difficulty()
-    if states.state == 'game': 
-        if states.mode == 'Easy':
-            player_group.remove(chick, rabbit, bird)
-            states.background_image = pygame.image.load(f"/Users/jfv/Desktop/Serpent Sprint/Graphics/Background/FrogBackground.png").convert()
-            states.player = frog
-            states.number_pythons = 4
-            Settings.get_settings().mode = 'Easy'
-        elif states.mode == 'Medium':
-            player_group.remove(frog, chick, bird)
-            states.background_image = pygame.image.load(f"/Users/jfv/Desktop/Serpent Sprint/Graphics/Background/RabbitBackground.png").convert()
-            states.player = rabbit
-            states.number_pythons = 5
-            Settings.get_settings().mode = 'Medium'
-        elif states.mode == 'Hard':
-            player_group.remove(frog, rabbit, bird)
-            states.background_image = pygame.image.load(f"/Users/jfv/Desktop/Serpent Sprint/Graphics/Background/ChickBackground.png").convert()
-            states.player = chick
-            states.number_pythons = 6
-            Settings.get_settings().mode = 'Hard'
-        elif states.mode == 'Story':
-            print('went through')
-            player_group.remove(frog, rabbit, chick)
-            states.background_image = pygame.image.load(f"/Users/jfv/Desktop/Serpent Sprint/Graphics/Background/FrogBackground.png").convert()
-            states.player = bird
-            states.number_pythons = 4
-            is_story_running = True
-            Settings.get_settings().mode = 'Story'
-        is_intro_running = False
-
-
-delivery_text = TextSprite(name_image=f"Tweet tweet!! Delivery for {game.name}!!",
-                          location_x=game.width_screen,
-                          location_y=150,
-                          groups=(story_group))
-instructional_text = TextSprite(name_image=f"Press Enter to open it!!",
-                          location_x=game.width_screen,
-                          location_y=200,
-                          groups=(story_group))
-
-delivery_text.draw_middle()
-instructional_text.draw_middle()
-
-while is_story_running:
-    pygame.display.update()
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_RETURN:
-                states.state = 'game'
-                states.state = 'Story'
-                is_story_running = False
-                is_story_running_2 = True
-
-    game.screen.fill('white')
-    story_group.draw(game.screen)
-    story_group.update()
-    pygame.display.update()
-
-story2_group = pygame.sprite.Group()
-letter2 = ButtonSprite(name_image='Letter',
-                       location_x=0,
-                       location_y=0,
-                       groups = (story2_group))
-
-while is_story_running_2:
-    pygame.display.update()
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_RETURN:
-                states.state = 'game'
-                states.state = 'Story'
-                is_story_running_2 = False
-
-    game.screen.fill('white')
-    story2_group.draw(game.screen)
-    story2_group.update()
-    pygame.display.update()
-
-
-for _ in range(states.number_pythons):
-    create_obstacle(width=random.randint(600, 1120), group=obstaclesprites, )
-
-game_over_group = pygame.sprite.Group()
-pause_group = pygame.sprite.Group()
-
-python_marathon_title = ButtonSprite(
-    name_image = 'PythonMarathonTitle', 
-    location_x = 452, 
-    location_y = 94,
-    groups = (game_over_group, pause_group))
-
-end_game = ButtonSprite(
-    name_image='End',
-    location_x=442,
-    location_y=266,
-    groups = (game_over_group))
-
-game_over = TextSprite(name_image = 'GAME OVER', 
-                    location_x = 373, 
-                    location_y = 365,
-                    groups = (game_over_group))
-game_over.draw_middle()
-
-
-game_over = TextSprite(name_image = 'PAUSED', 
-                    location_x = 373, 
-                    location_y = 365,
-                    groups = (pause_group))
-game_over.draw_middle()
-
-score_screen = TextSpriteWhite(name_image = f'Score {game.score}', 
-                    location_x = 0, 
-                    location_y = 0,
-                    groups = (textsprites, allsprites))
-
-health = TextSpriteWhite(name_image = f'Health: {states.player.health}', 
-                    location_x = 0, 
-                    location_y = 20 + score_screen.rect.height,
-                    groups = (textsprites, allsprites)) 
-
-def draw_game_over():
-    game = Settings.get_settings()
-    pygame.draw.rect(game.surface, (128, 128, 128, 150), [0, 0, Settings.get_settings().width_screen, Settings.get_settings().height_screen ])
-    game.screen.blit(game.surface, (0, 0) )
-    game_over_group.draw(game.screen)
-    game_over_group.update()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RETURN:
+                    states.state = 'game'
+                    states.state = 'Story'
+                    is_story_running_2 = False
+
+        game.screen.fill('white')
+        story2_group.draw(game.screen)
+        story2_group.update()
+        pygame.display.update()
+        game.scheduler.tick()
+        states.end_frame('story')
 
-def draw_pause():
+def draw_overlay(overlay_group):
+    """
+    Draws the grey cover and the sprites of the game over or pause overlay over the whole screen.
+    """
     game = Settings.get_settings()
     pygame.draw.rect(game.surface, (128, 128, 128, 150), [0, 0, Settings.get_settings().width_screen, Settings.get_settings().height_screen ])
     game.screen.blit(game.surface, (0, 0) )
-    pause_group.draw(game.screen)
-    pause_group.update()
-
-
-is_game_running = True
-while is_game_running:
-    import sys
-    pygame.display.update()
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE:
-                if is_paused:
-                    is_paused = False
-                    print('f')
-                else:
-                    is_paused = True
-                    print('t')
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if end_game.is_clicked(event):
-                Settings.get_settings().update_csv()
-                is_game_running = False
-
-        if game.health <= 0:
-            is_game_over = True
-            draw_game_over()
+    overlay_group.draw(game.screen)
+    overlay_group.update()
+
+def run_game(states):
+    """
+    Runs the main loop of the game until the player clicks End. Quitting the window saves the recording and the profile and exits.
+    """
+    game = states.game
+    textsprites = pygame.sprite.Group()
+    allsprites = pygame.sprite.Group()
+
+    # The player, the pythons and the collisions are simulated by the GameCore. This module only handles the events and draws it.
+    input_source = DodgeBot() if game.use_autoplay else KeyboardInput()
+
+    # A recorded game needs a seed so that it can be played again exactly
+    recorder = None
+    if game.replay_path is not None:
+        if game.seed is None:
+            game.set_seed(random.randrange(2 ** 31))
+        recorder = RecordingInput(input_source)
+        input_source = recorder
+
+    def save_recording():
+        if recorder is not None:
+            save_replay(game.replay_path, recorder.replay(game.seed, states.mode))
+
+    states.core = GameCore(states.mode, input_source = input_source, seed = game.seed)
+    states.player = states.core.player
+    obstaclesprites = states.core.obstaclesprites
+    player_group = states.core.player_group
+
+    game_over_group = pygame.sprite.Group()
+    pause_group = pygame.sprite.Group()
+
+    python_marathon_title = ButtonSprite(
+        name_image = 'PythonMarathonTitle', 
+        location_x = 452, 
+        location_y = 94,
+        groups = (game_over_group, pause_group))
+
+    end_game = ButtonSprite(
+        name_image='End',
+        location_x=442,
+        location_y=266,
+        groups = (game_over_group))
+
+    game_over = TextSprite(name_image = 'GAME OVER', 
+                        location_x = 373, 
+                        location_y = 365,
+                        groups = (game_over_group))
+    game_over.draw_middle()
+
+
+    game_over = TextSprite(name_image = 'PAUSED', 
+                        location_x = 373, 
+                        location_y = 365,
+                        groups = (pause_group))
+    game_over.draw_middle()
+
+    score_screen = TextSpriteWhite(name_image = f'Score {game.score}', 
+                        location_x = 0, 
+                        location_y = 0,
+                        groups = (textsprites, allsprites),
+                        use_glyph_cache = True)
+
+    health = TextSpriteWhite(name_image = f'Health: {states.player.health}', 
+                        location_x = 0, 
+                        location_y = 20 + score_screen.rect.height,
+                        groups = (textsprites, allsprites),
+                        use_glyph_cache = True) 
+
+    renderer = DirtyRectRenderer(is_enabled = game.use_dirty_rects)
+
+    # Every phase of the main loop is timed. F3 shows the percentiles and turns the profiler on if it is off.
+    profiler = FrameProfiler(is_enabled = game.use_profiler)
+    states.core.profiler = profiler
+
+    def save_profile():
+        if profiler.frames > 0:
+            profiler.export(game.profile_path)
+
+    is_paused = False
+    is_game_over = False
+    is_game_running = True
+    game.scheduler.reset()
+    game.timestep.reset()
+    while is_game_running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                save_recording()
+                save_profile()
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    if is_paused:
+                        is_paused = False
+                        print('f')
+                    else:
+                        is_paused = True
+                        print('t')
+                # F2 switches between drawing only the changed areas and drawing the whole screen
+                if event.key == pygame.K_F2:
+                    renderer.is_enabled = not renderer.is_enabled
+                    renderer.invalidate()
+                if event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                # F4 starts cProfile and the sampling profiler, and pressing it again writes the .pstats and .collapsed files
+                if event.key == pygame.K_F4:
+                    states.runtime_profiler.toggle()
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if end_game.is_clicked(event):
+                    Settings.get_settings().update_csv()
+                    is_game_running = False
+
+            if game.health <= 0:
+                is_game_over = True
+                draw_overlay(game_over_group)
+        profiler.lap('events')
+
+        if not is_paused and not is_game_over:
+            # The simulation runs in fixed steps, so several steps are run after a slow frame instead of slowing down the game
+            for _ in range(game.timestep.advance(game.scheduler.frame_time)):
+                if states.core.step(game.timestep.dt):
+                    health.set_text(f'Health: {game.health}')
+        else:
+            game.timestep.reset()
+
+        # The sprites are drawn in between the last two simulation steps
+        for sprite in obstaclesprites.sprites() + player_group.sprites():
+            sprite.interpolate(game.timestep.alpha)
+        profiler.lap('interpolate')
+
+        score_screen.set_text(f'Score: {game.score}')
+        profiler.lap('text')
+
+        # Only the areas of the screen that changed are cleared and drawn again
+        renderer.draw(game.screen, states.background_image, (obstaclesprites, textsprites, player_group, profiler.overlay_group))
+        profiler.lap('draw')
+        
+        if not is_paused and not is_game_over:
+            textsprites.update()
+            #allsprites.update()
+        profiler.lap('text')
             
-    game.screen.blit(states.background_image, (0, 0))
-
-    obstaclesprites.draw(game.screen)
-    #allsprites.draw(game.screen)
-    textsprites.draw(game.screen)
-    player_group.draw(game.screen)
-    
-    if not is_paused and not is_game_over:
-        obstaclesprites.update()
-        textsprites.update()
-        #allsprites.update()
-        player_group.update()
+        # The overlays cover the whole screen, so the whole screen has to be drawn again
+        if is_paused:    
+            draw_overlay(pause_group)
+            renderer.invalidate()
         
-    if is_paused:    
-        draw_pause()
-    
-    if is_game_over:
-        draw_game_over()
-
-    # Use the function of spritecollide where it checks if the player object has collided with any of the Obstacle sprites
-    collision_obstacles = pygame.sprite.spritecollide(states.player, obstaclesprites, True)
-    collision_text = pygame.sprite.spritecollide(states.player, textsprites, False)
-
-    score_screen.name_image = f'Score: {game.score}'
-
-    if collision_obstacles:
-        #print("Player collided with an enemy!")
-        create_obstacle(group=obstaclesprites)
-        game = Settings.get_settings()
-        game.health -= 1
-        health.name_image = f'Health: {game.health}'
-        health.image = health.font.render(health.name_image, False, 'black')
-    
-    if game.health <= 0:
-        draw_game_over()
-
+        if is_game_over or game.health <= 0:
+            draw_overlay(game_over_group)
+            renderer.invalidate()
+
+        profiler.lap('draw')
+
+        renderer.present()
+        profiler.lap('present')
+        game.scheduler.tick()
+        profiler.lap('wait')
+        profiler.end_frame()
+        states.end_frame('paused' if is_paused else 'game over' if is_game_over else 'game')
+
+    save_recording()
+    save_profile()
+
+def main():
+    # SERPENT_PROFILE=all profiles everything from the start of the game, including the Settings and the loading of the assets
+    runtime_profiler = RuntimeProfiler.from_environment()
+    if 'all' in runtime_profiler.targets:
+        runtime_profiler.start('all')
+
+    # The profiles are also written when the window is closed, since closing it calls sys.exit()
+    try:
+        states = GameState(runtime_profiler)
+        if run_introduction(states):
+            run_story(states)
+        run_game(states)
+    finally:
+        runtime_profiler.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+File: GameCore.py
+
+This module focuses on the GameCore class, which is the simulation of one game without any drawing, events or sounds.
+Game.py draws the GameCore on the screen, but the GameCore can also be run headless, without a window or audio,
+as fast as the computer can simulate it:
+    "result = run_headless('Easy', ScriptedInput([RIGHT] * 300), max_ticks = 10000, seed = 2024)"
+
+A GameCore that is given a seed draws every random number from Settings.rng seeded with it,
+so the same seed and the same input always give the same pythons and the same score.
+
+Headless runs use the dummy video and audio drivers of SDL. The display still has to exist for convert_alpha(),
+but nothing is ever drawn on it.
+"""
+
+import os
+import pygame
+from Settings import Settings
+from Collision import SpatialHash, collide_rect_mask
+from Sprite import create_player, create_obstacle, obstacle_pool
+
+# The player character, background and number of pythons of every mode. The characters are in CHARACTERS of Sprite.py.
+MODES = {'Easy': {'character': 'Frog', 'background': 'FrogBackground', 'number_pythons': 4},
+         'Medium': {'character': 'Rabbit', 'background': 'RabbitBackground', 'number_pythons': 5},
+         'Hard': {'character': 'Chick', 'background': 'ChickBackground', 'number_pythons': 6},
+         'Story': {'character': 'LetterBird', 'background': 'FrogBackground', 'number_pythons': 4}}
+
+class GameCore():
+    """
+    The GameCore is the player, the pythons and the collisions of one game.
+
+    Attributes:
+        mode (str): The mode of the game, which is a key of MODES.
+        number_pythons (int): The number of pythons. It is the one of the mode unless another number is given.
+        obstaclesprites (Group): The pythons.
+        player_group (Group): The group of the player.
+        player (PlayerSprite): The player.
+        engine (ObstacleEngine): The engine that moves the pythons if Settings.use_obstacle_engine is True, otherwise None.
+        spatial_hash (SpatialHash): The grid of the pythons if Settings.use_spatial_hash is True, otherwise None.
+        ticks (int): The number of simulation steps so far.
+        hits (int): The number of pythons that hit the player.
+        profiler (FrameProfiler): The profiler that times the obstacles, the player and the collisions of every step, if any.
+
+    Methods:
+        step(dt): Runs one simulation step. Returns the pythons that hit the player.
+        is_over(): Returns True if the player has no health left.
+        result(): Returns the score, ticks and hits of the game as a dictionary.
+    """
+    def __init__(self, mode, input_source = None, number_pythons = None, seed = None):
+        game = Settings.get_settings()
+        if seed is not None:
+            game.set_seed(seed)
+        self.mode = mode
+        self.number_pythons = number_pythons if number_pythons is not None else MODES[mode]['number_pythons']
+        self.obstaclesprites = pygame.sprite.Group()
+        self.player_group = pygame.sprite.Group()
+        self.ticks = 0
+        self.hits = 0
+        self.profiler = None
+
+        # Only the character of the chosen mode is made, so the other characters are never loaded
+        self.player = create_player(MODES[mode]['character'], groups = (self.player_group), input_source = input_source)
+        game.score = 0
+        game.health = self.player.health
+
+        # With many pythons, the ObstacleEngine moves all of them at once with NumPy
+        self.engine = None
+        if game.use_obstacle_engine:
+            from ObstacleEngine import ObstacleEngine
+            self.engine = ObstacleEngine(rng = game.rng)
+
+        # With many pythons, the player is only checked against the pythons in nearby cells
+        self.spatial_hash = SpatialHash() if game.use_spatial_hash else None
+
+        # An input source such as the DodgeBot has to see the player and the pythons
+        self.player.strategy_pattern.input_source.attach(self.player, self.obstaclesprites, self.spatial_hash)
+
+        for _ in range(self.number_pythons):
+            self.add_obstacle(create_obstacle(width=game.rng.randint(600, 1120), group=self.obstaclesprites, rng=game.rng))
+
+    def add_obstacle(self, obstacle):
+        if self.engine is not None:
+            self.engine.add(obstacle)
+        if self.spatial_hash is not None:
+            self.spatial_hash.insert(obstacle)
+
+    def remove_obstacle(self, obstacle):
+        """
+        Takes the python out of the ObstacleEngine and the SpatialHash and puts it back in the obstacle_pool.
+        """
+        if self.engine is not None:
+            self.engine.remove(obstacle)
+        if self.spatial_hash is not None:
+            self.spatial_hash.remove(obstacle)
+        obstacle_pool.release(obstacle)
+
+    def step(self, dt = 1):
+        game = Settings.get_settings()
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.lap('simulation')
+
+        if self.engine is not None:
+            self.engine.step(dt)
+        else:
+            self.obstaclesprites.update(dt)
+        if profiler is not None:
+            profiler.lap('obstacles')
+
+        self.player_group.update(dt)
+        self.ticks += 1
+        if profiler is not None:
+            profiler.lap('player')
+
+        # Use the function of spritecollide where it checks if the player object has collided with any of the Obstacle sprites
+        # The rectangles are always the broad phase. The masks are only compared if the rectangles collide.
+        collided = collide_rect_mask if game.use_mask_collision else None
+        if self.spatial_hash is not None:
+            collision_obstacles = self.spatial_hash.collide(self.player, dokill = False, collided = collided)
+        else:
+            collision_obstacles = pygame.sprite.spritecollide(self.player, self.obstaclesprites, False, collided)
+
+        if collision_obstacles:
+            # The pythons that were hit go back to the pool instead of being destroyed
+            for sprite in collision_obstacles:
+                self.remove_obstacle(sprite)
+
+            self.add_obstacle(create_obstacle(group=self.obstaclesprites, rng=game.rng))
+            game.health -= 1
+            self.hits += len(collision_obstacles)
+
+        if profiler is not None:
+            profiler.lap('collision')
+        return collision_obstacles
+
+    def is_over(self):
+        return Settings.get_settings().health <= 0
+
+    def result(self):
+        return {'mode': self.mode, 'score': Settings.get_settings().score, 'ticks': self.ticks, 'hits': self.hits}
+
+def start_headless():
+    """
+    Starts pygame with the dummy video and audio drivers of SDL, so that no window is opened and no sound is played.
+    It has to be called before anything else opens the display.
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    Settings.get_settings().start_game()
+
+def run_headless(mode, input_source, max_ticks = 100000, number_pythons = None, seed = None):
+    """
+    Plays one game of the mode without a window until the player has no health left or max_ticks simulation steps have passed.
+    Nothing is drawn and the FrameScheduler is never ticked, so the game runs far faster than real time.
+    Returns the result() of the GameCore.
+    """
+    if pygame.display.get_surface() is None:
+        start_headless()
+
+    core = GameCore(mode, input_source, number_pythons, seed)
+    dt = Settings.get_settings().timestep.dt
+    while core.ticks < max_ticks and not core.is_over():
+        core.step(dt)
+
+    for sprite in core.obstaclesprites.sprites():
+        core.remove_obstacle(sprite)
+    return core.result()
+
+# This is to time a headless game of every mode with a player that only moves up and down.
+if __name__ == "__main__":
+    import time
+    from Input import ScriptedInput, UP, DOWN
+
+    start_headless()
+    script = [UP] * 30 + [DOWN] * 30
+    for mode in MODES:
+        start = time.perf_counter()
+        result = run_headless(mode, ScriptedInput(script, is_repeating = True), max_ticks = 20000, seed = 2024)
+        seconds = time.perf_counter() - start
+        print(f"{mode:>7}: {result}, {result['ticks'] / seconds:.0f} ticks per second")
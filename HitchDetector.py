@@ -0,0 +1,145 @@
+"""
+File: HitchDetector.py
+
+This module focuses on the HitchDetector class. An average frame time hides the single frames that are much slower,
+such as the frame where a PNG is decoded, a sound is loaded or a font is opened. The HitchDetector writes down every frame
+that took longer than its budget, together with what caused it:
+    "hitches = HitchDetector(fps = 30)
+    ...
+    game.scheduler.tick()
+    hitches.end_frame(game.scheduler.frame_time, states.state)"
+
+Every record has the state of the game, the assets that were loaded and the pythons that were made during the frame
+(see load_listeners of AssetCache.py), the garbage collections, and a sample of the stack of the main thread
+that is taken by a watchdog thread while the frame is still running late.
+The records are JSON lines in a rotating log file, so old hitches are removed once the log is large.
+"""
+
+import gc
+import json
+import logging
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+import AssetCache
+
+class HitchDetector():
+    """
+    The HitchDetector records the frames that took longer than budget seconds.
+
+    Attributes:
+        budget (float): The number of seconds after which a frame is a hitch. It is budget_factor times 1/fps.
+        frames (int): The number of frames so far.
+        hitches (int): The number of hitches so far.
+        events (list): The loads, pythons and garbage collections of the current frame.
+        stack (list): The stack sample of the current frame, if the frame took longer than the budget.
+        frame_start (float): The time the current frame started from time.perf_counter().
+        logger (Logger): The logger that writes the records to the rotating log file.
+
+    Methods:
+        end_frame(frame_time, state): Records the frame if it was a hitch and starts the next frame.
+        record_load(kind, name, seconds): Adds a load to the current frame. It is one of the load_listeners of AssetCache.py.
+        stop(): Stops the watchdog thread and the hooks.
+    """
+    def __init__(self, fps, budget_factor = 1.5, log_path = 'Hitches.jsonl', max_bytes = 1000000, backup_count = 3):
+        self.budget = budget_factor / fps
+        self.frames = 0
+        self.hitches = 0
+        self.events = []
+        self.stack = None
+        self.frame_start = time.perf_counter()
+        self.gc_start = None
+
+        self.logger = logging.getLogger('hitches')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            handler = RotatingFileHandler(log_path, maxBytes = max_bytes, backupCount = backup_count)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.logger.addHandler(handler)
+
+        AssetCache.load_listeners.append(self.record_load)
+        gc.callbacks.append(self.record_gc)
+
+        # The watchdog takes the stack sample while the main thread is still in the slow frame
+        self.main_thread_id = threading.main_thread().ident
+        self.is_running = True
+        self.watchdog = threading.Thread(target = self.watch, daemon = True)
+        self.watchdog.start()
+
+    def record_load(self, kind, name, seconds):
+        self.events.append({'kind': kind, 'name': name, 'ms': seconds * 1000})
+
+    def record_gc(self, phase, info):
+        if phase == 'start':
+            self.gc_start = time.perf_counter()
+        elif self.gc_start is not None:
+            self.events.append({'kind': 'gc', 'name': f"generation {info['generation']}", 'ms': (time.perf_counter() - self.gc_start) * 1000})
+            self.gc_start = None
+
+    def watch(self):
+        while self.is_running:
+            time.sleep(self.budget / 2)
+            if self.stack is None and time.perf_counter() - self.frame_start > self.budget:
+                frame = sys._current_frames().get(self.main_thread_id)
+                if frame is not None:
+                    self.stack = traceback.format_stack(frame)
+
+    def end_frame(self, frame_time, state):
+        """
+        Records the last frame if it took longer than the budget. It is called right after FrameScheduler.tick().
+
+        Args:
+            frame_time (float): The number of seconds of the frame, which is FrameScheduler.frame_time.
+            state (str): The state of the game during the frame, such as 'introduction' or 'game'.
+        """
+        self.frames += 1
+        if frame_time > self.budget:
+            self.hitches += 1
+            self.logger.info(json.dumps({'time': time.time(),
+                                         'frame': self.frames,
+                                         'frame_ms': frame_time * 1000,
+                                         'budget_ms': self.budget * 1000,
+                                         'state': state,
+                                         'events': self.events,
+                                         'stack': self.stack}))
+
+        self.events = []
+        self.stack = None
+        self.frame_start = time.perf_counter()
+
+    def stop(self):
+        self.is_running = False
+        if self.record_load in AssetCache.load_listeners:
+            AssetCache.load_listeners.remove(self.record_load)
+        if self.record_gc in gc.callbacks:
+            gc.callbacks.remove(self.record_gc)
+        for handler in self.logger.handlers:
+            handler.flush()
+
+# This makes one slow frame that loads a frame and checks that it is recorded as a hitch.
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from Settings import Settings
+    from GameCore import start_headless
+
+    start_headless()
+    game = Settings.get_settings()
+    path = os.path.join(tempfile.gettempdir(), 'Hitches.jsonl')
+    hitches = HitchDetector(game.fps, log_path = path)
+
+    for frame in range(10):
+        if frame == 5:
+            AssetCache.AssetCache.get_cache().get_frame('Python', 1)
+            time.sleep(0.1)
+        game.scheduler.tick()
+        hitches.end_frame(game.scheduler.frame_time, 'game')
+    hitches.stop()
+
+    with open(path) as file:
+        record = json.loads(file.readlines()[-1])
+    print(f"{hitches.hitches} hitch in {hitches.frames} frames: {record['frame_ms']:.1f} ms, events {record['events']}")
+    print("Stack sample:", record['stack'][-1].strip() if record['stack'] else None)
@@ -0,0 +1,159 @@
+"""
+File: Input.py
+
+This module focuses on the InputSource class. PlayerUpdating used to read pygame.key.get_pressed() itself,
+so the player could only be moved by someone at the keyboard. PlayerUpdating now asks its InputSource which keys are pressed,
+so the same game can be played by the keyboard, by a script or by a replay:
+    "player.strategy_pattern.input_source = ScriptedInput([RIGHT, RIGHT | UP, 0])"
+
+The four arrow keys that the player uses are stored as a bitmask, so the keys of one simulation step fit in one byte.
+
+The DodgeBot is an InputSource that plays by itself. It looks at the pythons in front of the player and moves out of their way,
+so the game can be left running for hours without anyone at the keyboard.
+"""
+
+from abc import ABC, abstractmethod
+import pygame
+from Settings import Settings
+
+RIGHT = 1
+LEFT = 2
+UP = 4
+DOWN = 8
+
+# The bit of every arrow key that PlayerUpdating reads
+KEY_BITS = {pygame.K_RIGHT: RIGHT,
+            pygame.K_LEFT: LEFT,
+            pygame.K_UP: UP,
+            pygame.K_DOWN: DOWN}
+
+def to_bitmask(keys):
+    """
+    Returns the bitmask of the arrow keys that are pressed in keys, which is indexed like pygame.key.get_pressed().
+    """
+    bitmask = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            bitmask |= bit
+    return bitmask
+
+class PressedKeys():
+    """
+    PressedKeys is indexed like the result of pygame.key.get_pressed(), but it is made from a bitmask of the arrow keys.
+    Every other key is never pressed.
+    """
+    def __init__(self, bitmask):
+        self.bitmask = bitmask
+
+    def __getitem__(self, key):
+        return bool(self.bitmask & KEY_BITS.get(key, 0))
+
+class InputSource(ABC):
+    """
+    InputSource is the interface for whatever moves the player.
+
+    Methods:
+        get_pressed(): Returns the pressed keys of the current simulation step. PlayerUpdating calls it once per step.
+                       This is an abstract method.
+        attach(player, obstaclesprites, spatial_hash): Called by GameCore once the game is made, for the input sources
+                       that need to see the game. It does nothing by default.
+    """
+    @abstractmethod
+    def get_pressed(self):
+        pass
+
+    def attach(self, player, obstaclesprites, spatial_hash = None):
+        pass
+
+class KeyboardInput(InputSource):
+    """The keys that the player is pressing on the keyboard."""
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+class ScriptedInput(InputSource):
+    """
+    The keys are read from a script with one bitmask for every simulation step. Nothing is pressed after the script ends,
+    unless is_repeating is True, in which case the script starts again.
+
+    Attributes:
+        script (sequence): The bitmasks of the arrow keys, such as a list or bytes.
+        is_repeating (bool): True if the script starts again after its last step.
+        tick (int): The number of steps that were read.
+    """
+    def __init__(self, script, is_repeating = False):
+        self.script = script
+        self.is_repeating = is_repeating
+        self.tick = 0
+
+    def get_pressed(self):
+        if self.tick < len(self.script):
+            bitmask = self.script[self.tick]
+        elif self.is_repeating and self.script:
+            bitmask = self.script[self.tick % len(self.script)]
+        else:
+            bitmask = 0
+        self.tick += 1
+        return PressedKeys(bitmask)
+
+class DodgeBot(InputSource):
+    """
+    The DodgeBot moves the player up or down out of the way of the pythons that are about to hit it.
+    Only the pythons inside a look-ahead rectangle in front of the player are looked at. If the game has a SpatialHash,
+    only the pythons in its cells are checked, so the bot stays cheap even with hundreds of pythons.
+
+    Attributes:
+        look_ahead (int): How many pixels in front of the player a python is dodged.
+        margin (int): How many pixels above and below the player a python is still dodged.
+        player (PlayerSprite): The player that is moved by the bot.
+        obstaclesprites (Group): The pythons.
+        spatial_hash (SpatialHash): The grid of the pythons, or None if the game does not have one.
+    """
+    def __init__(self, look_ahead = 250, margin = 20):
+        self.look_ahead = look_ahead
+        self.margin = margin
+        self.player = None
+        self.obstaclesprites = None
+        self.spatial_hash = None
+
+    def attach(self, player, obstaclesprites, spatial_hash = None):
+        self.player = player
+        self.obstaclesprites = obstaclesprites
+        self.spatial_hash = spatial_hash
+
+    def get_pressed(self):
+        if self.player is None:
+            return PressedKeys(0)
+
+        rect = self.player.rect
+        danger = pygame.Rect(rect.left, rect.top - self.margin, rect.width + self.look_ahead, rect.height + 2 * self.margin)
+        if self.spatial_hash is not None:
+            pythons = self.spatial_hash.query(danger)
+        else:
+            pythons = self.obstaclesprites.sprites()
+
+        top, bottom = None, None
+        for python in pythons:
+            if danger.colliderect(python.rect):
+                top = python.rect.top if top is None else min(top, python.rect.top)
+                bottom = python.rect.bottom if bottom is None else max(bottom, python.rect.bottom)
+
+        height_screen = Settings.get_settings().height_screen
+        if top is None:
+            # Nothing is coming, so the player goes back to the middle where it can dodge both ways
+            middle = height_screen // 2
+            if rect.centery < middle - self.margin:
+                return PressedKeys(DOWN)
+            if rect.centery > middle + self.margin:
+                return PressedKeys(UP)
+            return PressedKeys(0)
+
+        # The player goes to whichever side of the pythons is closer and still on the screen
+        distance_up = rect.bottom - top + self.margin
+        distance_down = bottom - rect.top + self.margin
+        can_go_up = top - self.margin - rect.height >= 0
+        can_go_down = bottom + self.margin + rect.height <= height_screen
+        if can_go_up and (distance_up <= distance_down or not can_go_down):
+            return PressedKeys(UP)
+        if can_go_down:
+            return PressedKeys(DOWN)
+        return PressedKeys(UP if rect.centery > height_screen // 2 else DOWN)
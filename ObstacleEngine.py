@@ -0,0 +1,217 @@
+"""
+File: ObstacleEngine.py
+
+This module focuses on the ObstacleEngine class. Instead of every ObstalceSprite moving itself through its own strategy object,
+the ObstacleEngine stores the positions, velocities, strategies and animation indices of all pythons in NumPy arrays
+and moves all of them at once. This is for configurations with many pythons, where the per-sprite strategies become too slow.
+The sprites are still drawn and collided with like before since the engine writes their rect and image back after every step:
+    "engine = ObstacleEngine()
+    engine.add(create_obstacle(group=obstaclesprites))
+    engine.step(dt)"
+
+Given the same seed of Settings.rng, the engine moves the pythons exactly like LinearUpdating, SinoidUpdating,
+UpwardsUpdating and DownwardsUpdating do.
+"""
+
+import numpy as np
+from Settings import Settings
+from Sprite import LinearUpdating, SinoidUpdating, UpwardsUpdating, DownwardsUpdating
+
+LINEAR = 0
+SINOID = 1
+UPWARDS = 2
+DOWNWARDS = 3
+
+STRATEGY_TYPES = {LinearUpdating: LINEAR,
+                  SinoidUpdating: SINOID,
+                  UpwardsUpdating: UPWARDS,
+                  DownwardsUpdating: DOWNWARDS}
+
+class ObstacleEngine():
+    """
+    The ObstacleEngine moves every python in one batched step.
+
+    Attributes:
+        count (int): The number of pythons in the engine.
+        sprites (list): The ObstalceSprites in the engine. The order is the same as the order of their group.
+        location_x, location_y (ndarray): The positions of the pythons, like location_x and location_y of UpdatingStrategy.
+        velocity (ndarray): The horizontal velocity of every python.
+        strategy (ndarray): The type of strategy of every python, such as LINEAR or SINOID.
+        index (ndarray): The animation index of every python.
+        framespeed (ndarray): The rate of change of the frames of every python.
+        width, height (ndarray): The size of the first frame of every python, which is used to know when it left the screen.
+        number_images (ndarray): The length of the animation of every python.
+        rng (Random): The random numbers of the reappearing pythons. The default is Settings.rng.
+
+    Methods:
+        add(sprite): Adds an ObstalceSprite and copies the state of its strategy into the arrays.
+        remove(sprite): Removes an ObstalceSprite, for example after it collided with the player.
+        step(dt): Moves and animates every python by one simulation step.
+    """
+    def __init__(self, capacity = 16, rng = None):
+        self.rng = rng if rng is not None else Settings.get_settings().rng
+        self.count = 0
+        self.sprites = []
+        self.location_x = np.zeros(capacity)
+        self.location_y = np.zeros(capacity)
+        self.velocity = np.zeros(capacity)
+        self.strategy = np.zeros(capacity, dtype=np.int8)
+        self.index = np.zeros(capacity)
+        self.framespeed = np.zeros(capacity)
+        self.width = np.zeros(capacity)
+        self.height = np.zeros(capacity)
+        self.number_images = np.zeros(capacity)
+
+    def arrays(self):
+        return [self.location_x, self.location_y, self.velocity, self.strategy, self.index,
+                self.framespeed, self.width, self.height, self.number_images]
+
+    def grow(self):
+        """
+        grow() is a helper method that doubles the capacity of every array.
+        """
+        capacity = len(self.location_x) * 2
+        for name in ['location_x', 'location_y', 'velocity', 'strategy', 'index', 'framespeed', 'width', 'height', 'number_images']:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self, sprite):
+        if self.count == len(self.location_x):
+            self.grow()
+
+        pattern = sprite.strategy_pattern
+        i = self.count
+        self.location_x[i] = pattern.location_x
+        self.location_y[i] = pattern.location_y
+        self.velocity[i] = pattern.velocity
+        self.strategy[i] = STRATEGY_TYPES[type(pattern)]
+        self.index[i] = pattern.index
+        self.framespeed[i] = pattern.framespeed
+        self.width[i] = pattern.images[0].get_rect().width
+        self.height[i] = pattern.images[0].get_rect().height
+        self.number_images[i] = len(pattern.sequence)
+
+        self.sprites.append(sprite)
+        self.count += 1
+
+    def remove(self, sprite):
+        # The order must stay the same as the group so that the random numbers are used in the same order
+        i = self.sprites.index(sprite)
+        for array in self.arrays():
+            array[i:self.count - 1] = array[i + 1:self.count]
+        self.sprites.pop(i)
+        self.count -= 1
+
+    def step(self, dt = 1):
+        """
+        Moves and animates every python by one simulation step. dt is measured in frames of the original 30 frames per second.
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        game = Settings.get_settings()
+        x = self.location_x[:n]
+        y = self.location_y[:n]
+        velocity = self.velocity[:n]
+        strategy = self.strategy[:n]
+
+        # SinoidUpdating uses the horizontal position before the step for its wave
+        is_sinoid = strategy == SINOID
+        change_y = np.zeros(n)
+        change_y[is_sinoid] = velocity[is_sinoid] * np.sin((np.pi * x[is_sinoid]) / (40 * velocity[is_sinoid])) * dt
+        change_y[strategy == UPWARDS] = -2 * dt
+        change_y[strategy == DOWNWARDS] = 2 * dt
+
+        x -= velocity * dt
+        y += change_y
+
+        self.reappear(game, n)
+
+        # Change the indices so that there is animation in the sprite, like UpdatingStrategy.change_index_frames()
+        index = self.index[:n]
+        index += self.framespeed[:n] * dt
+        index[index > self.number_images[:n]] = 0
+
+        for i, sprite in enumerate(self.sprites):
+            sprite.previous_position = sprite.position
+            sprite.rect.topleft = (x[i], y[i])
+            sprite.position = sprite.rect.topleft
+            frame = sprite.sequence[int(index[i])]
+            sprite.image = sprite.images[frame]
+            if sprite.masks:
+                sprite.mask = sprite.masks[frame]
+            if sprite.spatial_hash is not None:
+                sprite.spatial_hash.move(sprite)
+
+    def reappear(self, game, n):
+        """
+        reappear() is a helper method that puts the pythons that left the screen back on the other side,
+        like UpdatingStrategy.reappear() and SinoidUpdating.reappear().
+        """
+        x = self.location_x[:n]
+        y = self.location_y[:n]
+        width = self.width[:n]
+        height = self.height[:n]
+        is_sinoid = self.strategy[:n] == SINOID
+
+        left = x <= -width
+        right = ~left & (x >= game.width_screen + width)
+        top = ~left & ~right & (y <= -height)
+        bottom = ~left & ~right & ~top & (y >= game.height_screen + height)
+
+        # SinoidUpdating only checks the left side of the screen and does not add to the score
+        right &= ~is_sinoid
+        top &= ~is_sinoid
+        bottom &= ~is_sinoid
+
+        # The random numbers are drawn in the order of the sprites, exactly like the sprites would draw them one by one
+        for i in np.flatnonzero(left | right | top | bottom):
+            i = int(i)
+            if left[i] and is_sinoid[i]:
+                velocity = int(self.velocity[i])
+                y[i] = self.rng.randint(velocity, game.height_screen - int(height[i]) - velocity)
+                x[i] = game.width_screen
+                continue
+
+            if left[i]:
+                y[i] = self.rng.randint(0, game.height_screen - int(height[i]))
+                x[i] = game.width_screen
+            elif right[i]:
+                y[i] = self.rng.randint(0, game.height_screen - int(height[i]))
+                x[i] = -int(width[i])
+            elif top[i]:
+                y[i] = self.rng.randint(game.height_screen // 2, game.height_screen * 2)
+                x[i] = game.width_screen
+            else:
+                y[i] = self.rng.randint(-game.height_screen * 2, -game.height_screen // 2)
+                x[i] = game.width_screen
+            game.score += 1
+
+# This is to test out if the ObstacleEngine moves the pythons exactly like their strategies.
+if __name__ == "__main__":
+    import pygame
+    from Sprite import create_obstacle
+
+    game = Settings.get_settings()
+    game.start_game()
+
+    def simulate(use_engine, steps = 2000):
+        game.set_seed(2024)
+        game.score = 0
+        group = pygame.sprite.Group()
+        engine = ObstacleEngine()
+        for _ in range(50):
+            obstacle = create_obstacle(width=game.rng.randint(600, 1120), group=group)
+            engine.add(obstacle)
+
+        for _ in range(steps):
+            if use_engine:
+                engine.step()
+            else:
+                group.update()
+        return [sprite.rect.topleft for sprite in group], game.score
+
+    print("Same as the strategies:", simulate(True) == simulate(False))
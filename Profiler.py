@@ -0,0 +1,148 @@
+"""
+File: Profiler.py
+
+This module focuses on the FrameProfiler class, which measures how long every phase of a frame of the main loop takes,
+such as handling the events, moving the pythons, the collisions, drawing and waiting for the next frame.
+The main loop calls lap() after every phase, and the time since the last lap is added to that phase:
+    "profiler.lap('events')
+    ...
+    profiler.lap('draw')
+    profiler.end_frame()"
+
+The last frames of every phase are kept, so the 50th, 95th and 99th percentiles can be shown on the screen with F3
+and saved as JSON when the game ends. The overlay is a sprite in overlay_group, so the DirtyRectRenderer draws it like the others.
+When the profiler is disabled, lap() returns right away, so it costs almost nothing.
+"""
+
+import json
+import time
+from collections import deque
+import pygame
+from Settings import Settings
+from AssetCache import FontRegistry, FONT_PATH
+
+class FrameProfiler():
+    """
+    The FrameProfiler keeps the time of every phase of the last frames.
+
+    Attributes:
+        is_enabled (bool): True if the phases are measured.
+        is_overlay_shown (bool): True if the percentiles are drawn on the screen.
+        window (int): The number of frames that are kept for every phase.
+        samples (dict): The nanoseconds of every phase for the last frames. The key is the name of the phase.
+        current (dict): The nanoseconds of every phase in the current frame. A phase can happen more than once in a frame,
+            such as the simulation steps, so its laps are added together.
+        last (int): The time of the last lap from time.perf_counter_ns().
+        frames (int): The number of frames that were measured.
+        overlay (Sprite): The sprite of the table of percentiles.
+        overlay_group (Group): The group that has the overlay while it is shown. It is drawn after the other groups.
+
+    Methods:
+        lap(phase): Adds the time since the last lap to the phase.
+        end_frame(): Keeps the times of the current frame and starts the next frame.
+        toggle_overlay(): Shows or hides the overlay. Showing it also enables the profiler.
+        percentiles(): Returns the p50, p95, p99 and mean of every phase in milliseconds.
+        export(path): Saves the percentiles and the kept frames as JSON.
+    """
+    def __init__(self, is_enabled = False, window = 300):
+        self.is_enabled = is_enabled
+        self.is_overlay_shown = False
+        self.window = window
+        self.samples = {}
+        self.current = {}
+        self.last = time.perf_counter_ns()
+        self.frames = 0
+        self.overlay = pygame.sprite.Sprite()
+        self.overlay_group = pygame.sprite.Group()
+
+    def lap(self, phase):
+        if not self.is_enabled:
+            return
+        now = time.perf_counter_ns()
+        self.current[phase] = self.current.get(phase, 0) + now - self.last
+        self.last = now
+
+    def end_frame(self):
+        if not self.is_enabled:
+            return
+
+        # A phase that did not happen in this frame, such as the simulation while paused, took no time
+        for phase in self.current:
+            if phase not in self.samples:
+                self.samples[phase] = deque(maxlen = self.window)
+        for phase, samples in self.samples.items():
+            samples.append(self.current.get(phase, 0))
+
+        self.current.clear()
+        self.frames += 1
+
+        # The overlay is only made again a few times per second so that it does not slow down the frames it measures.
+        # The time it takes is not added to the next frame.
+        if self.is_overlay_shown and self.frames % 15 == 0:
+            self.update_overlay()
+        self.last = time.perf_counter_ns()
+
+    def toggle_overlay(self):
+        self.is_overlay_shown = not self.is_overlay_shown
+        if not self.is_overlay_shown:
+            self.overlay.kill()
+            return
+
+        if not self.is_enabled:
+            self.is_enabled = True
+            self.current.clear()
+            self.last = time.perf_counter_ns()
+        self.update_overlay()
+        self.overlay_group.add(self.overlay)
+
+    def percentiles(self):
+        result = {}
+        for phase, samples in self.samples.items():
+            ordered = sorted(samples)
+            if not ordered:
+                continue
+            result[phase] = {'p50': ordered[int(0.50 * (len(ordered) - 1))] / 1e6,
+                             'p95': ordered[int(0.95 * (len(ordered) - 1))] / 1e6,
+                             'p99': ordered[int(0.99 * (len(ordered) - 1))] / 1e6,
+                             'mean': sum(ordered) / len(ordered) / 1e6}
+        return result
+
+    def update_overlay(self):
+        """
+        update_overlay() is a helper method that renders the table of percentiles in the top right corner.
+        The table is opaque, since the DirtyRectRenderer may draw it again over itself when a sprite moves under it.
+        """
+        font = FontRegistry.get_registry().get_font(FONT_PATH, 10)
+        lines = [f"{'phase':<11}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for phase, values in self.percentiles().items():
+            lines.append(f"{phase:<11}{values['p50']:>7.2f}{values['p95']:>7.2f}{values['p99']:>7.2f}")
+
+        rendered = [font.render(line, False, 'white') for line in lines]
+        width = max(line.get_width() for line in rendered) + 10
+        height = sum(line.get_height() for line in rendered) + 10
+        overlay = pygame.Surface((width, height))
+        overlay.fill((0, 0, 0))
+        location_y = 5
+        for line in rendered:
+            overlay.blit(line, (5, location_y))
+            location_y += line.get_height()
+
+        self.overlay.image = overlay
+        self.overlay.rect = overlay.get_rect(topright = (Settings.get_settings().width_screen, 0))
+
+    def export(self, path):
+        with open(path, 'w') as file:
+            json.dump({'frames': self.frames,
+                       'percentiles': self.percentiles(),
+                       'samples': {phase: list(samples) for phase, samples in self.samples.items()}}, file)
+
+# This is to measure how much lap() costs when the profiler is disabled and when it is enabled.
+if __name__ == "__main__":
+    for is_enabled in [False, True]:
+        profiler = FrameProfiler(is_enabled)
+        start = time.perf_counter_ns()
+        for frame in range(100000):
+            for phase in ['events', 'simulation', 'draw', 'present']:
+                profiler.lap(phase)
+            profiler.end_frame()
+        print(f"Enabled: {is_enabled}, {(time.perf_counter_ns() - start) / 100000:.0f} ns per frame of 4 phases")
@@ -0,0 +1,103 @@
+"""
+File: Renderer.py
+
+This module focuses on the DirtyRectRenderer class. Most of the game screen does not change between two frames,
+since only the player, the pythons and the texts move. Instead of drawing the whole background and updating the whole display,
+the renderer only clears and updates the areas of the sprites that changed:
+    "renderer = DirtyRectRenderer()
+    renderer.draw(game.screen, background_image, (obstaclesprites, textsprites, player_group))
+    renderer.present()"
+"""
+
+import pygame
+
+class DirtyRectRenderer():
+    """
+    DirtyRectRenderer keeps track of where every sprite was drawn in the last frame.
+
+    Attributes:
+        is_enabled (bool): True if only the changed areas are drawn. If False, the whole screen is drawn every frame like before.
+        needs_full_redraw (bool): True if the next frame has to draw the whole screen, for example after an overlay was drawn.
+        previous (dict): The rectangle and image of every sprite in the last frame.
+        dirty_rects (list): The areas of the screen that changed in this frame. None if the whole screen changed.
+
+    Methods:
+        draw(screen, background, groups): Draws the groups on the screen, clearing only what has changed.
+        invalidate(): Makes the current and the next frame update the whole screen.
+        present(): Updates the display with the areas that changed.
+    """
+    def __init__(self, is_enabled = True):
+        self.is_enabled = is_enabled
+        self.needs_full_redraw = True
+        self.previous = {}
+        self.dirty_rects = None
+
+    def draw(self, screen, background, groups):
+        """
+        Draws the groups on the screen in the given order.
+
+        Args:
+            screen (Surface): The display surface.
+            background (Surface): The image that is behind every sprite.
+            groups (tuple of Group): The groups to draw. A later group is drawn above an earlier one.
+        """
+        screen_rect = screen.get_rect()
+        current = {}
+        for group in groups:
+            for sprite in group:
+                current[sprite] = (sprite.rect.clip(screen_rect), sprite.image)
+
+        if not self.is_enabled or self.needs_full_redraw:
+            screen.blit(background, (0, 0))
+            for group in groups:
+                group.draw(screen)
+            self.previous = current
+            self.needs_full_redraw = False
+            self.dirty_rects = None
+            return
+
+        # A sprite changed if it moved, changed its frame, or was removed. Its old and new areas are cleared.
+        changed = set()
+        cleared = []
+        for sprite, (rect, image) in current.items():
+            previous = self.previous.get(sprite)
+            if previous is None or previous[0] != rect or previous[1] is not image:
+                changed.add(sprite)
+                cleared.append(rect)
+                if previous is not None:
+                    cleared.append(previous[0])
+        for sprite, (rect, image) in self.previous.items():
+            if sprite not in current:
+                cleared.append(rect)
+
+        # A sprite that did not change but overlaps a cleared area is cleared and drawn again as a whole,
+        # so its translucent edges are not drawn over themselves. Its area may overlap other sprites, so this is repeated.
+        redrawn = set(changed)
+        while True:
+            overlapping = [sprite for sprite, (rect, image) in current.items() if sprite not in redrawn and rect.collidelist(cleared) != -1]
+            if not overlapping:
+                break
+            for sprite in overlapping:
+                redrawn.add(sprite)
+                cleared.append(current[sprite][0])
+
+        for rect in cleared:
+            screen.blit(background, rect, rect)
+
+        self.dirty_rects = cleared
+        for group in groups:
+            for sprite in group:
+                if sprite in redrawn:
+                    screen.blit(sprite.image, sprite.rect)
+
+        self.previous = current
+
+    def invalidate(self):
+        self.needs_full_redraw = True
+        self.dirty_rects = None
+
+    def present(self):
+        if self.dirty_rects is None:
+            pygame.display.update()
+        elif self.dirty_rects:
+            pygame.display.update(self.dirty_rects)
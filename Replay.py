@@ -0,0 +1,151 @@
+"""
+File: Replay.py
+
+This module records games and plays them back. Since every random number of a game comes from Settings.rng,
+a game is known completely from its seed, its mode and the arrow keys of every simulation step.
+A replay file is a short header followed by one byte per simulation step with the bitmask of the arrow keys:
+    "recorder = RecordingInput(KeyboardInput())
+    ...
+    save_replay('game.replay', recorder.replay(seed, mode))
+    result = play_replay('game.replay')"
+
+A replay is played through the GameCore as fast as the computer can, either headless or drawn on the screen,
+so the same game can be used to find a slow frame or to compare two versions of the game.
+"""
+
+import struct
+import pygame
+from Settings import Settings
+from Input import InputSource, ScriptedInput, PressedKeys, to_bitmask
+
+MAGIC = b'SSRP'
+VERSION = 1
+
+# The magic, version, flags, seed, tick rate and length of the name of the mode
+HEADER = struct.Struct('<4sBBqHB')
+
+# The flags of the Settings that change the game and not only its speed
+MASK_COLLISION = 1
+
+class Replay():
+    """
+    A Replay is everything needed to play a game again.
+
+    Attributes:
+        seed (int): The seed of Settings.rng.
+        mode (str): The mode of the game.
+        tick_rate (int): The number of simulation steps per second, which decides the size of every step.
+        flags (int): The flags of the Settings, such as MASK_COLLISION.
+        ticks (bytearray): The bitmask of the arrow keys of every simulation step.
+    """
+    def __init__(self, seed, mode, tick_rate, flags = 0, ticks = None):
+        self.seed = seed
+        self.mode = mode
+        self.tick_rate = tick_rate
+        self.flags = flags
+        self.ticks = ticks if ticks is not None else bytearray()
+
+    def to_bytes(self):
+        mode = self.mode.encode('utf-8')
+        return HEADER.pack(MAGIC, VERSION, self.flags, self.seed, self.tick_rate, len(mode)) + mode + bytes(self.ticks)
+
+    @staticmethod
+    def from_bytes(data):
+        magic, version, flags, seed, tick_rate, length_mode = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("The data is not a replay of this version of the game")
+        start = HEADER.size + length_mode
+        return Replay(seed, data[HEADER.size:start].decode('utf-8'), tick_rate, flags, bytearray(data[start:]))
+
+class RecordingInput(InputSource):
+    """
+    RecordingInput passes on the keys of another InputSource and keeps the bitmask of every simulation step.
+
+    Attributes:
+        source (InputSource): The input source that is recorded, such as the KeyboardInput or the DodgeBot.
+        ticks (bytearray): The recorded bitmasks.
+    """
+    def __init__(self, source):
+        self.source = source
+        self.ticks = bytearray()
+
+    def attach(self, player, obstaclesprites, spatial_hash = None):
+        self.source.attach(player, obstaclesprites, spatial_hash)
+
+    def get_pressed(self):
+        # The game is given the bitmask and not the keys themselves, so it sees exactly what the replay will have
+        bitmask = to_bitmask(self.source.get_pressed())
+        self.ticks.append(bitmask)
+        return PressedKeys(bitmask)
+
+    def replay(self, seed, mode):
+        """
+        Returns the Replay of the recorded game. The seed has to be the one the game was played with.
+        """
+        game = Settings.get_settings()
+        flags = MASK_COLLISION if game.use_mask_collision else 0
+        return Replay(seed, mode, game.tick_rate, flags, self.ticks)
+
+def save_replay(path, replay):
+    with open(path, 'wb') as file:
+        file.write(replay.to_bytes())
+
+def load_replay(path):
+    with open(path, 'rb') as file:
+        return Replay.from_bytes(file.read())
+
+def play_replay(replay, is_rendered = False):
+    """
+    Plays the replay, which is a Replay or the path of a replay file, through the GameCore without waiting between frames.
+    If is_rendered is True, every step is drawn on the screen. Otherwise the game is played headless.
+    Returns the result() of the GameCore.
+    """
+    from GameCore import GameCore, MODES, start_headless
+    from Scheduler import FixedTimestep
+
+    if not isinstance(replay, Replay):
+        replay = load_replay(replay)
+
+    game = Settings.get_settings()
+    if pygame.display.get_surface() is None:
+        if is_rendered:
+            game.start_game()
+        else:
+            start_headless()
+    game.use_mask_collision = bool(replay.flags & MASK_COLLISION)
+
+    core = GameCore(replay.mode, ScriptedInput(replay.ticks), seed = replay.seed)
+    dt = FixedTimestep(replay.tick_rate).dt
+    if is_rendered:
+        from AssetCache import AssetCache
+        background = AssetCache.get_cache().get_image(f"/Users/jfv/Desktop/Serpent Sprint/Graphics/Background/{MODES[replay.mode]['background']}.png", has_alpha = False)
+
+    for _ in range(len(replay.ticks)):
+        core.step(dt)
+        if is_rendered:
+            pygame.event.pump()
+            game.screen.blit(background, (0, 0))
+            core.obstaclesprites.draw(game.screen)
+            core.player_group.draw(game.screen)
+            pygame.display.update()
+    return core.result()
+
+# This records a game of the DodgeBot, saves it and checks that playing it back gives the same game.
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from GameCore import GameCore, start_headless
+    from Input import DodgeBot
+
+    start_headless()
+    recorder = RecordingInput(DodgeBot())
+    core = GameCore('Hard', recorder, seed = 2024)
+    dt = Settings.get_settings().timestep.dt
+    while not core.is_over() and core.ticks < 20000:
+        core.step(dt)
+    recorded = core.result()
+
+    path = os.path.join(tempfile.gettempdir(), 'Hard.replay')
+    save_replay(path, recorder.replay(2024, 'Hard'))
+    print(f"Recorded {core.ticks} steps in {os.path.getsize(path)} bytes")
+    print("Same as the recorded game:", play_replay(path) == recorded)
@@ -0,0 +1,144 @@
+"""
+File: RuntimeProfiler.py
+
+This module focuses on the RuntimeProfiler class, which profiles the game while it is running without changing Game.py.
+It runs cProfile and a sampling profiler at the same time. cProfile writes a .pstats file for pstats or snakeviz,
+and the sampling profiler writes a .collapsed file with one line per stack, which flamegraph.pl and speedscope can read:
+    "GameProfile_game_1.pstats
+    GameProfile_game_1.collapsed"
+
+The profiler is turned on by the environment variable SERPENT_PROFILE, which is a list of the states of GameState to profile,
+such as 'game' or 'introduction,loading', or 'all' for the whole game:
+    "SERPENT_PROFILE=game python Game.py"
+F4 also starts and stops it during the game.
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+class RuntimeProfiler():
+    """
+    The RuntimeProfiler runs cProfile and a sampling profiler around a part of the game.
+
+    Attributes:
+        targets (set): The states of GameState that are profiled. 'all' profiles the whole game.
+        output_prefix (str): The start of the names of the written files.
+        interval (float): The number of seconds between two stack samples.
+        profile (Profile): The cProfile profiler while it is running, otherwise None.
+        stacks (Counter): The number of samples of every collapsed stack.
+        label (str): The name of what is being profiled, which is put in the names of the files.
+        runs (int): The number of times the profiler was stopped and saved.
+        state (str): The last state given to set_state().
+
+    Methods:
+        from_environment(): Returns a RuntimeProfiler with the targets of SERPENT_PROFILE. This is a static method.
+        start(label): Starts both profilers.
+        stop(): Stops both profilers and writes the files.
+        toggle(): Starts the profilers if they are stopped and stops them if they are running.
+        set_state(state): Starts or stops the profilers when the game enters or leaves a state in targets.
+    """
+    def __init__(self, targets = (), output_prefix = 'GameProfile', interval = 0.005):
+        self.targets = set(targets)
+        self.output_prefix = output_prefix
+        self.interval = interval
+        self.profile = None
+        self.stacks = Counter()
+        self.sampler = None
+        self.label = None
+        self.runs = 0
+        self.state = None
+
+    @staticmethod
+    def from_environment():
+        targets = [target.strip() for target in os.environ.get('SERPENT_PROFILE', '').split(',') if target.strip()]
+        return RuntimeProfiler(targets, os.environ.get('SERPENT_PROFILE_PREFIX', 'GameProfile'))
+
+    def is_running(self):
+        return self.profile is not None
+
+    def start(self, label = 'manual'):
+        if self.is_running():
+            return
+        self.label = label
+        self.stacks = Counter()
+        self.profile = cProfile.Profile()
+        self.sampler = threading.Thread(target = self.sample, args = (threading.main_thread().ident,), daemon = True)
+        self.profile.enable()
+        self.sampler.start()
+
+    def sample(self, thread_id):
+        """
+        sample() is a helper method that runs on its own thread and counts the stacks of the main thread.
+        A stack is collapsed into one line like 'Game.py:main;Game.py:run_game;GameCore.py:step'.
+        """
+        while self.profile is not None:
+            frame = sys._current_frames().get(thread_id)
+            names = []
+            while frame is not None:
+                names.append(f'{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}')
+                frame = frame.f_back
+            if names:
+                self.stacks[';'.join(reversed(names))] += 1
+            time.sleep(self.interval)
+
+    def stop(self):
+        """
+        Stops the profilers and returns the paths of the .pstats and .collapsed files, or None if they were not running.
+        """
+        if not self.is_running():
+            return None
+
+        profile = self.profile
+        profile.disable()
+        self.profile = None
+        self.sampler.join()
+
+        self.runs += 1
+        path = f'{self.output_prefix}_{self.label}_{self.runs}'
+        profile.dump_stats(path + '.pstats')
+        with open(path + '.collapsed', 'w') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f'{stack} {count}\n')
+        return path + '.pstats', path + '.collapsed'
+
+    def toggle(self):
+        if self.is_running():
+            self.stop()
+        else:
+            self.start()
+
+    def set_state(self, state):
+        """
+        Called on every frame with the state of the game. A state in targets is profiled from when it is entered until it is left.
+        """
+        if state == self.state:
+            return
+        self.state = state
+        if 'all' in self.targets:
+            return
+
+        if self.is_running() and self.label in self.targets and state != self.label:
+            self.stop()
+        if state in self.targets and not self.is_running():
+            self.start(state)
+
+# This profiles a few headless games and prints the slowest functions and stacks.
+if __name__ == "__main__":
+    import pstats
+    from GameCore import run_headless, start_headless
+    from Input import DodgeBot
+
+    start_headless()
+    profiler = RuntimeProfiler(output_prefix = 'HeadlessProfile', interval = 0.001)
+    profiler.start('headless')
+    for seed in range(5):
+        run_headless('Hard', DodgeBot(), max_ticks = 5000, number_pythons = 50, seed = seed)
+    pstats_path, collapsed_path = profiler.stop()
+
+    pstats.Stats(pstats_path).sort_stats('cumulative').print_stats(8)
+    with open(collapsed_path) as file:
+        print(''.join(file.readlines()[:3]))
@@ -0,0 +1,162 @@
+"""
+File: Scene.py
+
+This module focuses on the Scene class. Each state of GameState, such as 'introduction' or 'difficulty', has one Scene.
+A Scene builds its sprites, fonts and sounds once when the state is entered and keeps them alive,
+so that every frame only has to handle the events and draw the screen.
+The images and sounds of the scenes are decoded by the AssetLoader of GameState while the introduction is shown,
+and the LoadingScene keeps the screen running while the assets of the chosen mode are loaded.
+"""
+
+# Importing modules
+from abc import ABC, abstractmethod
+import sys
+import pygame
+from Settings import Settings
+from AssetCache import AssetCache
+from TextSprite import TextSprite, ButtonSprite
+
+class Scene(ABC):
+    """
+    Scene is the interface for the screens that are shown before the game starts.
+
+    Attributes:
+        states (GameState): The GameState that owns the scene. The scene changes its state and mode.
+        all_group (Group): The sprites that are drawn on every frame of the scene.
+
+    Methods:
+        handle_event(event): Reacts to a single event. This is an abstract method.
+        run(): Handles the events, finishes the assets that the AssetLoader decoded and draws the scene. It is called once per frame.
+        draw(): Draws all_group on the screen.
+    """
+    def __init__(self, states):
+        self.states = states
+        self.all_group = pygame.sprite.Group()
+
+    @abstractmethod
+    def handle_event(self, event):
+        pass
+
+    def run(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            self.handle_event(event)
+
+        # The assets decoded on the threads are converted here on the main thread, so the screen keeps running while they load
+        self.states.loader.process()
+        self.draw()
+
+    def draw(self):
+        game = Settings.get_settings()
+        game.screen.fill('white')
+        self.all_group.draw(game.screen)
+        self.all_group.update()
+        pygame.display.update()
+
+class IntroductionScene(Scene):
+    """The introduction screen where the player types in their name."""
+    def __init__(self, states):
+        super().__init__(states)
+        self.starting_sound_path = "/Users/jfv/Desktop/Serpent Sprint/Sound/Starting Game.mp3"
+
+        self.introduction_screen = ButtonSprite(name_image="Introduction",
+                                                location_x=0,
+                                                location_y=0,
+                                                groups=(self.all_group))
+
+        self.name = TextSprite(name_image= f"Name: {Settings.get_settings().name}",
+                               location_x=351,
+                               location_y=424,
+                               groups=(self.all_group))
+
+    def handle_event(self, event):
+        game = Settings.get_settings()
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_BACKSPACE and len(game.name) > 0:
+                game.name = game.name[:-1]
+            elif event.key == pygame.K_RETURN and game.name != "":
+                self.states.state = 'difficulty'
+                AssetCache.get_cache().get_sound(self.starting_sound_path).play()
+            else:
+                if event.unicode.isprintable() and len(game.name) < 8:
+                    game.name += event.unicode
+
+            # The name is only rendered again when a key was pressed
+            self.name.set_text(f"Name: {game.name}")
+
+class DifficultyScene(Scene):
+    """The screen where the player chooses the mode of the game."""
+    def __init__(self, states):
+        super().__init__(states)
+        self.starting_sound_path = "/Users/jfv/Desktop/Python Marathon/Sound/Starting Game.mp3"
+
+        self.easy_button = ButtonSprite(name_image='Easy',
+                                        location_x=80,
+                                        location_y=160,
+                                        groups=(self.all_group))
+
+        self.medium_button = ButtonSprite(name_image='Medium',
+                                          location_x=80,
+                                          location_y=314,
+                                          groups=(self.all_group))
+
+        self.hard_button = ButtonSprite(name_image='Hard',
+                                        location_x=80,
+                                        location_y=468,
+                                        groups=(self.all_group))
+
+        self.story_button = ButtonSprite(name_image='StoryMode',
+                                         location_x=789,
+                                         location_y=160,
+                                         groups=(self.all_group))
+
+        self.difficulty_text = TextSprite(name_image="C H O O S E  D I F F I C U L T Y",
+                                          location_x=80,
+                                          location_y=70,
+                                          groups=(self.all_group))
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.easy_button.is_clicked(event):
+                self.states.mode = 'Easy'
+                self.states.state = 'loading'
+
+            if self.medium_button.is_clicked(event):
+                self.states.mode = 'Medium'
+                self.states.state = 'loading'
+
+            if self.hard_button.is_clicked(event):
+                self.states.mode = 'Hard'
+                self.states.state = 'loading'
+
+            if self.story_button.is_clicked(event):
+                self.states.mode = 'Story'
+                self.states.state = 'loading'
+
+            AssetCache.get_cache().get_sound(self.starting_sound_path).play()
+
+class LoadingScene(Scene):
+    """
+    The screen that is shown while the AssetLoader finishes the assets of the chosen mode.
+    The state only changes to 'game' once every future of the loader is done, so the game never waits for a file.
+    """
+    def __init__(self, states):
+        super().__init__(states)
+        self.states.preload_mode()
+
+        self.loading_text = TextSprite(name_image="L O A D I N G  0%",
+                                       location_x=80,
+                                       location_y=70,
+                                       groups=(self.all_group))
+
+    def handle_event(self, event):
+        pass
+
+    def run(self):
+        self.loading_text.set_text(f"L O A D I N G  {self.states.loader.progress():.0%}")
+        super().run()
+
+        if self.states.loader.is_done():
+            self.states.state = 'game'
@@ -0,0 +1,124 @@
+"""
+File: Scheduler.py
+
+This module focuses on the FrameScheduler class. Every loop of the game calls tick() once per frame so that
+the game runs at Settings.fps instead of as fast as the computer can go:
+    "game = Settings.get_settings()
+    game.scheduler.tick()"
+"""
+
+import time
+
+class FrameScheduler():
+    """
+    The FrameScheduler paces the frames of the game using a hybrid of sleeping and busy-waiting.
+    time.sleep() lets the processor idle for most of the frame, but it can wake up late,
+    so the last few milliseconds before the deadline are spent busy-waiting for an accurate frame time.
+
+    Attributes:
+        fps (int): The frames per second the scheduler tries to keep.
+        is_uncapped (bool): True if the scheduler should not wait at all. This is for benchmarking.
+        spin_time (float): The number of seconds before the deadline where the scheduler stops sleeping and starts busy-waiting.
+        frame_time (float): The measured number of seconds between the last two calls of tick().
+        work_time (float): The number of seconds of the last frame that were spent on the game instead of waiting.
+        frame_count (int): The number of frames since the scheduler was created.
+
+    Methods:
+        tick(): Waits until the next frame should start and measures the frame time. This is called once per frame.
+        reset(): Forgets the previous deadline. Used after a long pause such as loading.
+        get_fps(): Returns the measured frames per second.
+    """
+    def __init__(self, fps, is_uncapped = False, spin_time = 0.002):
+        self.fps = fps
+        self.is_uncapped = is_uncapped
+        self.spin_time = spin_time
+        self.frame_time = 0.0
+        self.work_time = 0.0
+        self.frame_count = 0
+        self.last_tick = time.perf_counter()
+        self.deadline = self.last_tick
+
+    def tick(self):
+        """
+        Waits for the end of the current frame and returns the frame time in seconds.
+        """
+        start = time.perf_counter()
+        self.work_time = start - self.last_tick
+
+        if not self.is_uncapped and self.fps > 0:
+            period = 1 / self.fps
+            self.deadline += period
+
+            # If the game fell behind by more than a frame, do not try to catch up by skipping the waits
+            if start > self.deadline + period:
+                self.deadline = start + period
+
+            # Sleep for most of the frame, then busy-wait for the rest
+            remaining = self.deadline - time.perf_counter()
+            if remaining > self.spin_time:
+                time.sleep(remaining - self.spin_time)
+            while time.perf_counter() < self.deadline:
+                pass
+
+        now = time.perf_counter()
+        self.frame_time = now - self.last_tick
+        self.last_tick = now
+        if self.is_uncapped:
+            self.deadline = now
+        self.frame_count += 1
+        return self.frame_time
+
+    def reset(self):
+        self.last_tick = time.perf_counter()
+        self.deadline = self.last_tick
+
+    def get_fps(self):
+        if self.frame_time == 0:
+            return 0.0
+        return 1 / self.frame_time
+
+class FixedTimestep():
+    """
+    The FixedTimestep decouples the simulation of the game from the rendering.
+    The time of every rendered frame is added to an accumulator, and the simulation runs as many fixed steps as fit into it.
+    A slow frame then runs several steps instead of slowing the game down, and a fast frame may run none.
+
+    Attributes:
+        tick_rate (int): The number of simulation steps per second.
+        base_rate (int): The frame rate that the velocities of the strategies were made for. A step at this rate has dt = 1.
+        step_time (float): The number of seconds of one simulation step.
+        dt (float): The size of one step passed to the strategies, measured in frames of the base rate.
+        max_steps (int): The most steps that are run for one rendered frame so that a very long frame cannot freeze the game.
+        accumulator (float): The number of seconds that have not been simulated yet.
+        alpha (float): How far the rendered frame is between the previous and the current step. Used for interpolation.
+
+    Methods:
+        advance(frame_time): Adds the frame time to the accumulator and returns the number of steps to simulate.
+        reset(): Empties the accumulator. Used when the game is paused.
+    """
+    def __init__(self, tick_rate, base_rate = 30, max_steps = 5):
+        self.tick_rate = tick_rate
+        self.base_rate = base_rate
+        self.step_time = 1 / tick_rate
+        self.dt = base_rate / tick_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+    def advance(self, frame_time):
+        self.accumulator += frame_time
+        steps = int(self.accumulator // self.step_time)
+
+        # Drop the time that cannot be caught up instead of running more and more steps every frame
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_time
+
+        self.alpha = self.accumulator / self.step_time
+        return steps
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 1.0
@@ -7,10 +7,17 @@ Instead of having to write out the boilerplate code "pygame.init()..." in the ma
     "game = Settings.get_settings()
     game.start_game()"
 
+Making the Settings object does not open a window. The screen, font and background are only made the first time
+they are used or when start_game() is called, so the modules of the game can be imported by tools without a display.
+
 Creator: John Francis Y. Viray and Rohan A. Sachdev
 """
 
+import random
+import time
 import pygame
+from Scheduler import FrameScheduler, FixedTimestep
+from AssetCache import FontRegistry, FONT_PATH
 
 class Settings():
     """
@@ -21,12 +28,36 @@ class Settings():
         height_screen (int) : The height of the screen.
         background_color (tuple) : The RGB representation of a color. The color right now is white.
         fps (int) : The frames per second of the game.
+        scheduler (FrameScheduler) : Keeps every loop of the game at the given fps. Set scheduler.is_uncapped to True for benchmarking.
+        tick_rate (int) : The number of simulation steps per second. It is independent of the fps.
+        timestep (FixedTimestep) : Decides how many simulation steps are run for every rendered frame.
+        use_dirty_rects (bool) : True if the game only draws the areas of the screen that changed. False draws the whole screen every frame.
+        use_obstacle_engine (bool) : True if the pythons are moved all at once by the NumPy ObstacleEngine instead of by their own strategies.
+        use_mask_collision (bool) : True if the player and the pythons only collide when their visible pixels overlap, not only their rectangles.
+        use_spatial_hash (bool) : True if the player is only checked against the pythons in nearby cells of a SpatialHash.
+            Keeping the grid updated costs more than it saves unless there are many pythons, so it is False by default.
+        use_profiler (bool) : True if the FrameProfiler measures every phase of the main loop from the start. F3 also turns it on.
+        profile_path (str) : The path of the JSON file where the FrameProfiler is saved when the game ends.
+        use_hitch_detector (bool) : True if the frames that take longer than hitch_budget_factor times 1/fps are written to hitch_log_path.
+        hitch_budget_factor (float) : How many times 1/fps a frame can take before it is a hitch.
+        hitch_log_path (str) : The path of the rotating log of the HitchDetector.
+        replay_path (str) : The path where Game.py saves the Replay of the game, or None if the game is not recorded.
+        use_autoplay (bool) : True if the player is moved by the DodgeBot of Input.py instead of the keyboard, for soak testing.
+        screen (Surface) : The display. It is made the first time it is used.
+        surface (Surface) : The transparent Surface of the size of the screen used by the overlays. It is made the first time it is used.
+        font (Font) : The font of the game. It is opened the first time it is used.
+        background_image (Surface) : The background of make_basic_loop(). It is loaded the first time it is used.
+        seed (int) : The seed of rng, or None if the game was not seeded.
+        rng (Random) : The random numbers of the game. Every python and strategy draws from it instead of the random module,
+            so a game with the same seed and the same input is always the same game.
+        startup_times (dict) : The milliseconds that every phase of start_game() took, such as 'init', 'display' and 'fonts'.
         __instance (Settings): A class variable indicating whether an instance of the Settings class exists.
 
     Methods:
         get_settings(): Returns the instantiated Settings object. If it hasn't been created yet, it will create one. This is a static method.
         __init__(): Instantiates a Settings object only if it hasn't been created yet. This is a constructor.
-        start_game(): Sets up the game using pygame's functions such as pygame.init().
+        start_game(): Sets up the game using pygame's functions such as pygame.init() and opens the display.
+        set_seed(seed): Seeds rng so that the next game can be played again exactly.
     """
 
     __instance = None
@@ -43,11 +74,12 @@ class Settings():
                                             score = 0,
                                             health = 3, 
                                             fps = 30,
+                                            tick_rate = 30,
                                             name = '',
                                             mode = 'Easy')
         return Settings.__instance
     
-    def __init__(self, width_screen, height_screen, background_color, score, health, fps, name, mode):
+    def __init__(self, width_screen, height_screen, background_color, score, health, fps, tick_rate, name, mode):
         """
         Constructor creates the Settings object based on the width and height of the screen, the background color, and the frames-per-second (fps) of the game.
         """
@@ -58,25 +90,83 @@ class Settings():
         self.width_screen = width_screen
         self.height_screen = height_screen
         self.background_color = background_color
-        self.screen = pygame.display.set_mode((self.width_screen, self.height_screen))
-        self.surface = pygame.Surface((width_screen, height_screen), pygame.SRCALPHA)
+        self._screen = None
+        self._surface = None
+        self._font = None
+        self._background_image = None
+        self.startup_times = {}
         self.score = score
         self.health = health
         self.fps = fps
         self.name = name
         self.mode = mode
         self.clock = pygame.time.Clock()
-        pygame.font.init()
-        self.font = pygame.font.Font('/Users/jfv/Desktop/Python Marathon/Graphics/Pokemon_GB.ttf', 30)
-        self.background_image = pygame.image.load("/Users/jfv/Desktop/Serpent Sprint/Graphics/Background.png").convert()
+        self.scheduler = FrameScheduler(self.fps)
+        self.tick_rate = tick_rate
+        self.timestep = FixedTimestep(self.tick_rate)
+        self.use_dirty_rects = True
+        self.use_obstacle_engine = False
+        self.use_spatial_hash = False
+        self.use_mask_collision = False
+        self.use_autoplay = False
+        self.replay_path = None
+        self.use_profiler = False
+        self.profile_path = 'FrameProfile.json'
+        self.use_hitch_detector = False
+        self.hitch_budget_factor = 1.5
+        self.hitch_log_path = 'Hitches.jsonl'
+        self.seed = None
+        self.rng = random.Random()
+
+    def set_seed(self, seed):
+        self.seed = seed
+        self.rng.seed(seed)
+
+    @property
+    def screen(self):
+        if self._screen is None:
+            self._screen = pygame.display.set_mode((self.width_screen, self.height_screen))
+        return self._screen
+
+    @property
+    def surface(self):
+        if self._surface is None:
+            self._surface = pygame.Surface((self.width_screen, self.height_screen), pygame.SRCALPHA)
+        return self._surface
+
+    @property
+    def font(self):
+        if self._font is None:
+            self._font = FontRegistry.get_registry().get_font(FONT_PATH, 30)
+        return self._font
+
+    @property
+    def background_image(self):
+        # convert() needs the display, so the screen is made first if it is not there yet
+        if self._background_image is None:
+            self.screen
+            self._background_image = pygame.image.load("/Users/jfv/Desktop/Serpent Sprint/Graphics/Background.png").convert()
+        return self._background_image
     
     def start_game(self):
         """
-        Initialize Pygame for the visual effects and Pygame.mixer for the sound effects
+        Initialize Pygame for the visual effects and Pygame.mixer for the sound effects, then open the display.
+        The time of every phase is kept in startup_times.
         """
+        start = time.perf_counter()
         pygame.init()
         pygame.mixer.init()
+        self.startup_times['init'] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        self.screen
         pygame.display.set_caption("Serpent Sprint")
+        self.startup_times['display'] = (time.perf_counter() - start) * 1000
+
+        # Every font of the game is opened here so that no font file is opened while the game is running
+        start = time.perf_counter()
+        FontRegistry.get_registry().preload(FONT_PATH, (30,))
+        self.startup_times['fonts'] = (time.perf_counter() - start) * 1000
 
     def make_basic_loop(self):
         """
@@ -92,6 +182,7 @@ class Settings():
                 sys.exit()
         
         self.screen.blit(self.background_image, (0, 0))
+        self.scheduler.tick()
     
     def update_csv(self):
         import csv
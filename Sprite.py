@@ -10,14 +10,43 @@ Creator: John Francis Y. Viray, Bianca M. Manatad, and Caitlin Elaine L. Sebasti
 
 # Importing modules 
 from abc import ABC, abstractmethod
+from array import array
 import pygame
 import math
 from Settings import Settings
 from TextSprite import TextSprite
-import random
+from AssetCache import AssetCache, notify_load
+import time
+from Atlas import atlas_name, read_index
+from Input import KeyboardInput
+
+def load_atlas(name_image, scale):
+    """
+    Loads the atlas of the character made by Atlas.py and puts every frame in the AssetCache as a subsurface of the atlas.
+    The atlas is only looked for once. Returns False if there is no atlas or it is older than its PNGs,
+    in which case the frames are loaded one by one.
+    """
+    cache = AssetCache.get_cache()
+    key = (name_image, scale)
+    cache.wait_for_loader(key)
+    if key in cache.atlases:
+        return cache.atlases[key]
+
+    cache.atlases[key] = False
+    start = time.perf_counter()
+    index = read_index(name_image, scale)
+    if index is None:
+        return False
+    atlas = pygame.image.load(atlas_name(name_image, scale) + '.png').convert_alpha()
+
+    for number, rect in index['frames'].items():
+        cache.frames[(name_image, int(number), scale)] = atlas.subsurface(rect)
+    cache.atlases[key] = True
+    notify_load('atlas', atlas_name(name_image, scale), time.perf_counter() - start)
+    return True
 
 class CharacterSprite(ABC, pygame.sprite.Sprite):
-    def __init__(self, name_image, number_frames, location_x, location_y, strategy_pattern, groups, velocity = 1, is_facing_left = True, framespeed = 0.02):
+    def __init__(self, name_image, number_frames, location_x, location_y, strategy_pattern, groups, velocity = 1, is_facing_left = True, framespeed = 0.02, scale = None, rng = None):
         """
         The constructor method will initialize the following variables:
             name_image (str): The name of the sprite
@@ -29,11 +58,17 @@ class CharacterSprite(ABC, pygame.sprite.Sprite):
             velocity (int) : The velocity of the sprite in moving the horizontal direction
             is_facing_left (bool) : True if the sprite is facing to the left.
             framespeed (int) : The rate of change with the frames. The default is 1 frame per 1/30 second.
+            scale (float) : The percent decrease of rescale_percentage(). If it is given, the frames are loaded already scaled,
+                            from the atlas if there is one, and the full-sized frames are never loaded.
+            rng (Random) : The random numbers of the strategy. The default is Settings.rng.
             
         These variables are based on the given above:
-            images (list of Surface objects): A collection of images needed to display visual graphics
+            images (list of Surface objects): A collection of images needed to display visual graphics. There is one image per frame file.
+            masks (list of Mask objects): The masks of the images for pixel-accurate collision. They are made by rescale_percentage()
+            frame_numbers (list): The number of the frame file of every element of the images list
+            sequence (array): The order of the elements of the images list in the loopable animation
             image (Surface): An element from the images list
-            index (list): The index for referring to the elements in the images list. It is here for animation.
+            index (list): The index for referring to the elements in the sequence. It is here for animation.
             rect (Rectangle): A rectangle where all of the positions of the images will be determined
         """
 
@@ -45,16 +80,29 @@ class CharacterSprite(ABC, pygame.sprite.Sprite):
         self.framespeed = framespeed
         self.velocity = velocity
         self.is_facing_left = is_facing_left
+        self.scale = scale
+        self.rng = rng
         self.images = []
+        self.masks = []
         self.append_images()
-        self.image = self.images[int(self.number_frames - 1)]
+        self.image = self.images[self.sequence[int(self.number_frames - 1)]]
         self.index = 0
         
         # This rectangle is often used for collision detection and positioning the sprite on the screen.
         self.rect = self.image.get_rect()
         self.rect.topleft = (self.location_x, self.location_y)
 
-        self.strategy_pattern = strategy_pattern(self.images, self.location_x, self.location_y, self.rect, self.framespeed, self.velocity, self.number_frames, self.is_facing_left)
+        # The positions of the last two simulation steps. Rendering interpolates between them.
+        self.previous_position = self.rect.topleft
+        self.position = self.rect.topleft
+
+        # The SpatialHash the sprite is in, if any. It is set by SpatialHash.insert().
+        self.spatial_hash = None
+
+        self.strategy_pattern = strategy_pattern(self.images, self.location_x, self.location_y, self.rect, self.framespeed, self.velocity, self.number_frames, self.is_facing_left, self.sequence, self.rng)
+
+        if self.scale is not None:
+            self.rescale_percentage(self.scale)
 
     def create_indices(self):
         """
@@ -71,10 +119,16 @@ class CharacterSprite(ABC, pygame.sprite.Sprite):
     
     def append_images(self): 
         """append_images() is a helper method that will append a list of images so that sprite can have a loopable animation with its frames.""" 
-        # Append the frames to self.images
-        for i in self.create_indices():
-            self.images.append(
-                pygame.image.load(f'/Users/jfv/Desktop/Serpent Sprint/Graphics/{self.name_image}/{self.name_image}{str(i)}.png').convert_alpha())
+        # Every frame file is only appended once. The loopable animation is then a compact sequence of positions in self.images.
+        # The AssetCache makes sure each PNG is only decoded once for every sprite.
+        indices = self.create_indices()
+        self.frame_numbers = sorted(set(indices))
+        positions = {number: position for position, number in enumerate(self.frame_numbers)}
+        self.sequence = array('H', [positions[i] for i in indices])
+
+        load_atlas(self.name_image, self.scale)
+        for i in self.frame_numbers:
+            self.images.append(AssetCache.get_cache().get_frame(self.name_image, i, self.scale))
             
     def rescale_percentage(self, percentage):
         """
@@ -87,13 +141,18 @@ class CharacterSprite(ABC, pygame.sprite.Sprite):
         """
         assert percentage < 1, "Percentage has to be less than 1 since if greater, the width or height will become negative"
 
+        # The rescaled frames are also cached, so the same frames are not scaled again for every new sprite.
+        # Their masks are made here once, so that pixel-accurate collision does not have to make a mask every frame.
+        load_atlas(self.name_image, percentage)
+        self.masks = []
         for index in range(len(self.images)):
-            new_width = (self.images[index].get_rect().width) * (1 - percentage)
-            new_height = (self.images[index].get_rect().height) * (1 - percentage)
-            self.images[index] = pygame.transform.scale(self.images[index], (new_width, new_height))
+            self.images[index] = AssetCache.get_cache().get_frame(self.name_image, self.frame_numbers[index], percentage)
+            self.masks.append(AssetCache.get_cache().get_mask(self.name_image, self.frame_numbers[index], percentage))
+        self.image = self.images[self.sequence[int(self.number_frames - 1)]]
+        self.mask = self.masks[self.sequence[int(self.number_frames - 1)]]
         
-        self.rect.width = new_width
-        self.rect.height = new_height
+        self.rect.width = self.images[self.sequence[-1]].get_rect().width
+        self.rect.height = self.images[self.sequence[-1]].get_rect().height
         self.strategy_pattern.rect.width = self.rect.width
         self.strategy_pattern.rect.height = self.rect.height
     
@@ -103,13 +162,46 @@ class CharacterSprite(ABC, pygame.sprite.Sprite):
         #for index in range(len(self.images)):
             #self.images[index] = pygame.transform.flip(self.images[index], flip_x=1, flip_y=0)
 
+    def step(self, dt):
+        """
+        step() is a helper method that moves and animates the sprite by one simulation step of size dt.
+        The position before the step is kept so that rendering can interpolate between the two steps.
+        """
+        self.previous_position = self.position
+        self.rect.topleft = self.strategy_pattern.move(dt)
+        self.position = self.rect.topleft
+        frame = self.sequence[self.strategy_pattern.change_index_frames(dt)]
+        self.image = self.images[frame]
+        if self.masks:
+            self.mask = self.masks[frame]
+
+        if self.spatial_hash is not None:
+            self.spatial_hash.move(self)
+
+    def interpolate(self, alpha):
+        """
+        interpolate() places the rectangle between the last two simulation steps for drawing.
+        
+        Args:
+            alpha (float) : How far the display is between the previous step (0) and the current step (1).
+        """
+        previous_x, previous_y = self.previous_position
+        current_x, current_y = self.position
+
+        # If the sprite reappeared on the other side of the screen, it must not be drawn in between
+        if abs(current_x - previous_x) > self.rect.width or abs(current_y - previous_y) > self.rect.height:
+            self.rect.topleft = self.position
+        else:
+            self.rect.topleft = (previous_x + (current_x - previous_x) * alpha, 
+                                 previous_y + (current_y - previous_y) * alpha)
+
     @abstractmethod
-    def update(self):
+    def update(self, dt = 1):
         pass
 
 class PlayerSprite(CharacterSprite):
-    def __init__(self, name_image, number_frames, location_x, location_y, strategy_pattern, groups, velocity = 1, is_facing_left = True, framespeed = 0.02):
-        super().__init__(name_image, number_frames, location_x, location_y, strategy_pattern, groups, velocity, is_facing_left, framespeed)
+    def __init__(self, name_image, number_frames, location_x, location_y, strategy_pattern, groups, velocity = 1, is_facing_left = True, framespeed = 0.02, scale = None, rng = None):
+        super().__init__(name_image, number_frames, location_x, location_y, strategy_pattern, groups, velocity, is_facing_left, framespeed, scale, rng)
         self.health = 3
         self.score = 0
         
@@ -136,15 +228,10 @@ class PlayerSprite(CharacterSprite):
 
         return indices
     
-    def append_images(self):  
-        """Append the images to the list self.images"""
-        for i in self.create_indices():
-            self.images.append(
-                pygame.image.load(f'/Users/jfv/Desktop/Serpent Sprint/Graphics/{self.name_image}/{self.name_image}{str(i)}.png').convert_alpha())
-    
-    def update(self):
+    def update(self, dt = 1):
         """
         The sprite will update itself using the strategy pattern stated in its instantiation. 
+        dt is the size of the simulation step, where 1 is one frame at the original 30 frames per second.
 
         Updating basically just means that:
             1)  The sprite will move up, down, left or right. This is mainly seen in the names. 
@@ -158,22 +245,59 @@ class PlayerSprite(CharacterSprite):
         a player's input; and so on and so forth.
         """
         # This is where the Strategy Design Pattern is used. 
-        self.rect.topleft = self.strategy_pattern.move()
-        self.image = self.images[self.strategy_pattern.change_index_frames()]
+        self.step(dt)
 
 class ObstalceSprite(CharacterSprite):
-    def update(self):
-        self.rect.topleft = self.strategy_pattern.move()
-        self.image = self.images[self.strategy_pattern.change_index_frames()]
+    def __init__(self, name_image, number_frames, location_x, location_y, strategy_pattern, groups, velocity = 1, is_facing_left = True, framespeed = 0.02, scale = None, rng = None):
+        super().__init__(name_image, number_frames, location_x, location_y, strategy_pattern, groups, velocity, is_facing_left, framespeed, scale, rng)
+
+        # The strategy object of every strategy the python has had, so that a recycled python does not make them again
+        self.strategies = {strategy_pattern: self.strategy_pattern}
+
+    def update(self, dt = 1):
+        self.step(dt)
+
+    def reset(self, strategy_pattern, location_x, location_y, velocity, rng = None):
+        """
+        reset() places a recycled python back on the screen with a new strategy, position and velocity, like a new ObstalceSprite.
+        The strategy objects are kept for every strategy the sprite has had, so they are not made again.
+        """
+        self.rng = rng
+
+        # The python may come from a game that had a SpatialHash. It is only in the hash of this game once it is inserted again.
+        self.spatial_hash = None
+
+        strategy = self.strategies.get(strategy_pattern)
+        if strategy is None:
+            strategy = strategy_pattern(self.images, location_x, location_y, self.rect, self.framespeed, velocity, self.number_frames, self.is_facing_left, self.sequence, self.rng)
+            self.strategies[strategy_pattern] = strategy
+        strategy.rng = rng if rng is not None else Settings.get_settings().rng
+        strategy.reset(location_x, location_y, velocity)
+
+        self.strategy_pattern = strategy
+        self.location_x = location_x
+        self.location_y = location_y
+        self.velocity = velocity
+        self.rect.topleft = (location_x, location_y)
+        self.previous_position = self.rect.topleft
+        self.position = self.rect.topleft
+        frame = self.sequence[int(self.number_frames - 1)]
+        self.image = self.images[frame]
+        if self.masks:
+            self.mask = self.masks[frame]
 
 # Below are Updating Strategies.
 class UpdatingStrategy(ABC):
-    def __init__(self, images, location_x, location_y, rect, framespeed, velocity, number_frames, is_facing_left):
+    def __init__(self, images, location_x, location_y, rect, framespeed, velocity, number_frames, is_facing_left, sequence = None, rng = None):
         """
         The constructor method will initialize an updating strategy using the variables also used in 
+        The sequence is the order of the images in the animation. If it is not given, the images are played in order.
+        rng is where the random positions of reappear() are drawn from. If it is not given, it is Settings.rng.
         """
         pygame.sprite.Sprite.__init__(self)
+        self.rng = rng if rng is not None else Settings.get_settings().rng
         self.images = images
+        self.sequence = sequence if sequence is not None else array('H', range(len(images)))
         self.image = images[0]
         self.location_x = location_x
         self.location_y = location_y
@@ -190,18 +314,29 @@ class UpdatingStrategy(ABC):
         self.rect.topleft = (self.location_x, self.location_y)
 
     @abstractmethod
-    def move(self):
+    def move(self, dt = 1):
         """
         Moves and updates the sprite. Since UpdatingStrategy is just an interface, there is no concrete implementation yet.
+        dt is the size of the simulation step, where 1 is one frame at the original 30 frames per second.
+        Every velocity is multiplied by dt so that the speed of the game does not depend on the frame rate.
         """
         pass
 
-    def change_index_frames(self):
+    def reset(self, location_x, location_y, velocity):
+        """Puts the strategy back at its starting state so that it can be used again by a recycled sprite"""
+        self.location_x = location_x
+        self.location_y = location_y
+        self.velocity = velocity
+        self.index = 0
+        self.up = True
+        self.rect.topleft = (self.location_x, self.location_y)
+
+    def change_index_frames(self, dt = 1):
         """Change the indices so that there is animation in the sprite"""
-        self.index += self.framespeed
+        self.index += self.framespeed * dt
         
-        # To loop the code. If self.index is greater than the length of self.images, the animation must loop
-        if self.index > len(self.images):
+        # To loop the code. If self.index is greater than the length of self.sequence, the animation must loop
+        if self.index > len(self.sequence):
             self.index = 0
             #self.up = not self.up
         return int(self.index)
@@ -215,7 +350,7 @@ class UpdatingStrategy(ABC):
         
         # If the image crosses the left side of the border, reset it to be back at the right
         if self.location_x <= -self.images[0].get_rect().width:
-            random_height = random.randint(0, Settings.get_settings().height_screen-self.images[0].get_rect().height)
+            random_height = self.rng.randint(0, Settings.get_settings().height_screen-self.images[0].get_rect().height)
             self.rect.topleft = (Settings.get_settings().width_screen, random_height)
             self.location_x = self.rect.topleft[0]
             self.location_y = self.rect.topleft[1]
@@ -225,7 +360,7 @@ class UpdatingStrategy(ABC):
         
         # If the image crosses the right side of the border, reset it to be back at the left
         elif self.location_x >= Settings.get_settings().width_screen + self.images[0].get_rect().width:
-            random_height = random.randint(0, Settings.get_settings().height_screen-self.images[0].get_rect().height)
+            random_height = self.rng.randint(0, Settings.get_settings().height_screen-self.images[0].get_rect().height)
             self.rect.topleft = (-self.images[0].get_rect().width, random_height)
             self.location_x = self.rect.topleft[0]
             self.location_y = self.rect.topleft[1]
@@ -234,7 +369,7 @@ class UpdatingStrategy(ABC):
         
         # If the image crosses the top border, reset it at the lower bottom
         elif self.location_y <= -self.images[0].get_rect().height:
-            random_height = random.randint(Settings.get_settings().height_screen // 2, Settings.get_settings().height_screen*2)
+            random_height = self.rng.randint(Settings.get_settings().height_screen // 2, Settings.get_settings().height_screen*2)
             self.rect.topleft = (Settings.get_settings().width_screen, random_height)
             self.location_x = self.rect.topleft[0]
             self.location_y = self.rect.topleft[1]
@@ -243,7 +378,7 @@ class UpdatingStrategy(ABC):
 
         # If the image crosses the bottom border, reset it at the top 
         elif self.location_y >= Settings.get_settings().height_screen + self.images[0].get_rect().height:
-            random_height = random.randint(-Settings.get_settings().height_screen*2, -Settings.get_settings().height_screen // 2)
+            random_height = self.rng.randint(-Settings.get_settings().height_screen*2, -Settings.get_settings().height_screen // 2)
             self.rect.topleft = (Settings.get_settings().width_screen, random_height)
             self.location_x = self.rect.topleft[0]
             self.location_y = self.rect.topleft[1]
@@ -254,36 +389,38 @@ class UpdatingStrategy(ABC):
 
 class PlayerUpdating(UpdatingStrategy):
     """
-    Movement is handled by the player's input.
+    Movement is handled by the player's input. The keys are read from input_source, which is the keyboard
+    unless it is replaced by another InputSource of Input.py, such as a ScriptedInput.
     """
-    def __init__(self, images, location_x, location_y, rect, framespeed, velocity, number_frames, is_facing_left):
-        super().__init__(images, location_x, location_y, rect, framespeed, velocity, number_frames, is_facing_left)
+    def __init__(self, images, location_x, location_y, rect, framespeed, velocity, number_frames, is_facing_left, sequence = None, rng = None):
+        super().__init__(images, location_x, location_y, rect, framespeed, velocity, number_frames, is_facing_left, sequence, rng)
         self.is_right = not self.is_facing_left
         self.is_left = self.is_facing_left
+        self.input_source = KeyboardInput()
 
-    def move(self):
-        keys = pygame.key.get_pressed()
+    def move(self, dt = 1):
+        keys = self.input_source.get_pressed()
         if keys[pygame.K_RIGHT] and self.location_x <= Settings.get_settings().width_screen - self.images[0].get_rect().width:
-            self.location_x += self.velocity
+            self.location_x += self.velocity * dt
             self.is_right = True
             self.is_left = False
 
         if keys[pygame.K_LEFT] and self.location_x >= 0:
-            self.location_x -= self.velocity
+            self.location_x -= self.velocity * dt
             self.is_right = False
             self.is_left = True
 
         if keys[pygame.K_UP] and self.location_y >= 0:
-            self.location_y -= self.velocity
+            self.location_y -= self.velocity * dt
         
         if keys[pygame.K_DOWN] and self.location_y <= Settings.get_settings().height_screen - self.images[0].get_rect().height:
-            self.location_y += self.velocity
+            self.location_y += self.velocity * dt
 
         self.rect.topleft = (self.location_x, self.location_y)
         return self.rect.topleft
 
-    def change_index_frames(self):
-        self.index += self.framespeed
+    def change_index_frames(self, dt = 1):
+        self.index += self.framespeed * dt
 
         middle_index = (self.number_frames * 2 - 2)
     
@@ -300,8 +437,8 @@ class PlayerUpdating(UpdatingStrategy):
 
 class LinearUpdating(UpdatingStrategy):
     """Movement of the sprite can be described by a line"""
-    def move(self):
-        self.location_x -= self.velocity
+    def move(self, dt = 1):
+        self.location_x -= self.velocity * dt
         self.rect.topleft = (self.location_x, self.location_y)
         self.reappear()
         return self.rect.topleft
@@ -319,9 +456,9 @@ class BirdUpdating(UpdatingStrategy):
         images (list): Contains the images needed for a loopable animation
     """
 
-    def move(self):
-        # math.pi for the wave, len(self.images) so it goes up and down,
-        change = 15 * math.sin(self.index * math.pi / len(self.images))
+    def move(self, dt = 1):
+        # math.pi for the wave, len(self.sequence) so it goes up and down,
+        change = 15 * math.sin(self.index * math.pi / len(self.sequence))
 
         # The bird actually goes up or down
         
@@ -332,20 +469,20 @@ class BirdUpdating(UpdatingStrategy):
 
         return self.rect.topleft
     
-    def change_index_frames(self):
-        self.index += self.framespeed
+    def change_index_frames(self, dt = 1):
+        self.index += self.framespeed * dt
         
-        # To loop the code. If self.index is greater than the length of self.images, the animation must loop
-        if self.index >= len(self.images):
+        # To loop the code. If self.index is greater than the length of self.sequence, the animation must loop
+        if self.index >= len(self.sequence):
             self.index = 0
             self.up = not self.up
         return int(self.index)
 
 class SinoidUpdating(UpdatingStrategy):
     """Movement of a sprite can be described as a sine wave."""
-    def move(self):
-        change_x = -self.velocity
-        change_y = (self.velocity) * math.sin((math.pi * self.location_x)/(40 * self.velocity))
+    def move(self, dt = 1):
+        change_x = -self.velocity * dt
+        change_y = (self.velocity) * math.sin((math.pi * self.location_x)/(40 * self.velocity)) * dt
 
         # The python actually goes up or down
         self.location_x += change_x
@@ -362,7 +499,7 @@ class SinoidUpdating(UpdatingStrategy):
         if self.location_x <= -self.images[0].get_rect().width:
             length_image = self.images[0].get_rect().height
             # self.velocity is the peak/trough of any sine wave due to how transformations of functions work
-            random_height = random.randint(self.velocity, Settings.get_settings().height_screen - length_image - self.velocity)
+            random_height = self.rng.randint(self.velocity, Settings.get_settings().height_screen - length_image - self.velocity)
             self.rect.topleft = (Settings.get_settings().width_screen, random_height)
             self.location_x = self.rect.topleft[0]
             self.location_y = random_height
@@ -373,9 +510,9 @@ class UpwardsUpdating(UpdatingStrategy):
     It may be described similarly to free falling with horizontal and vertical components, 
     but there is no gravity since vertical velocity is constant
     """
-    def move(self):
-        self.location_x -= self.velocity
-        self.location_y -= 2
+    def move(self, dt = 1):
+        self.location_x -= self.velocity * dt
+        self.location_y -= 2 * dt
         self.rect.topleft = [self.location_x, self.location_y]
         self.reappear()
         return self.rect.topleft
@@ -384,30 +521,127 @@ class DownwardsUpdating(UpdatingStrategy):
     """
     The movement is similar to UpwardsUpdating.
     """
-    def move(self):
-        self.location_x -= self.velocity
-        self.location_y += 2
+    def move(self, dt = 1):
+        self.location_x -= self.velocity * dt
+        self.location_y += 2 * dt
         self.rect.topleft = [self.location_x, self.location_y]
         self.reappear()
         return self.rect.topleft
 
-def create_obstacle(group, width = Settings.get_settings().width_screen):
-    import random
+# The parameters of every character the player can play as
+CHARACTERS = {'Frog': {'number_frames': 2, 'velocity': 6, 'scale': 0.85},
+              'Rabbit': {'number_frames': 2, 'velocity': 9, 'scale': 0.85},
+              'Chick': {'number_frames': 3, 'velocity': 4, 'scale': 0.91},
+              'LetterBird': {'number_frames': 7, 'velocity': 3, 'scale': 0.3}}
 
-    random_strategy = random.choice([LinearUpdating, SinoidUpdating, UpwardsUpdating])
-    random_height = random.randint(0, Settings.get_settings().height_screen-100)
-    
-    obstacle = ObstalceSprite(name_image='Python', 
-                      number_frames=2, 
-                      location_x=width, 
-                      location_y=random_height, 
-                      strategy_pattern = random_strategy, 
-                      groups = group, 
-                      velocity=random.randint(3,5), 
-                      is_facing_left=False)
-    obstacle.rescale_percentage(0.93)
-    
-    return obstacle
+def preload_character(loader, name_image):
+    """
+    Queues the frames of the character on the AssetLoader, so that create_player() finds them in the AssetCache.
+    A PlayerSprite uses twice as many frame files as its number_frames, like PlayerSprite.create_indices().
+    """
+    character = CHARACTERS[name_image]
+    number_files = character['number_frames'] * 2 if character['number_frames'] != 1 else 2
+    loader.preload_frames(name_image, range(1, number_files + 1), character['scale'])
+
+def create_player(name_image, groups, input_source = None):
+    """
+    Returns the PlayerSprite of the character using its parameters in CHARACTERS.
+    Only the frames of this character are loaded. The player is moved by the keyboard unless another input_source is given.
+    """
+    character = CHARACTERS[name_image]
+    player = PlayerSprite(name_image = name_image, 
+                        number_frames = character['number_frames'],
+                        location_x = 0,
+                        location_y = 350, 
+                        strategy_pattern = PlayerUpdating, 
+                        groups = groups,
+                        velocity = character['velocity'],
+                        is_facing_left = False, 
+                        framespeed = 0.1,
+                        scale = character['scale'])
+    if input_source is not None:
+        player.strategy_pattern.input_source = input_source
+    return player
+
+class ObstaclePool():
+    """
+    ObstaclePool recycles the pythons instead of killing them and making new ones after every collision.
+    A released python keeps its images, masks and strategy objects, so getting it back does not allocate anything.
+
+    Attributes:
+        free (list): The pythons that are not in the game and can be used again.
+        created (int): The number of pythons that had to be made because the pool was empty.
+        reused (int): The number of pythons that were taken from the pool.
+        velocity_range (tuple): The smallest and largest velocity of a new python, which can be changed to balance the game.
+
+    Methods:
+        acquire(group, width, rng): Returns a python with a random strategy, height and velocity from rng, like create_obstacle().
+        release(sprite): Removes a python from its groups and puts it in the pool.
+        reserve(count): Makes pythons ahead of time until count are free, so that the first collisions do not have to make one.
+        stats(): Returns the size and the counters of the pool.
+    """
+    def __init__(self):
+        self.free = []
+        self.created = 0
+        self.reused = 0
+        self.velocity_range = (3, 5)
+
+    def make_obstacle(self, group, width, height, strategy_pattern, velocity, rng = None):
+        start = time.perf_counter()
+        obstacle = ObstalceSprite(name_image='Python', 
+                          number_frames=2, 
+                          location_x=width, 
+                          location_y=height, 
+                          strategy_pattern = strategy_pattern, 
+                          groups = group, 
+                          velocity=velocity, 
+                          is_facing_left=False,
+                          scale=0.93,
+                          rng=rng)
+        self.created += 1
+        notify_load('obstacle', 'Python', time.perf_counter() - start)
+        return obstacle
+
+    def acquire(self, group, width, rng):
+        # The random numbers are drawn in the same order as before so that the same seed gives the same game
+        random_strategy = rng.choice([LinearUpdating, SinoidUpdating, UpwardsUpdating])
+        random_height = rng.randint(0, Settings.get_settings().height_screen-100)
+        velocity = rng.randint(*self.velocity_range)
+
+        if not self.free:
+            return self.make_obstacle(group, width, random_height, random_strategy, velocity, rng)
+
+        obstacle = self.free.pop()
+        obstacle.reset(random_strategy, width, random_height, velocity, rng)
+        obstacle.add(group)
+        self.reused += 1
+        return obstacle
+
+    def release(self, sprite):
+        sprite.kill()
+        self.free.append(sprite)
+
+    def reserve(self, count):
+        # Only the missing pythons are made, so that a pool used by many games one after another does not keep growing
+        for _ in range(count - len(self.free)):
+            self.free.append(self.make_obstacle((), Settings.get_settings().width_screen, 0, LinearUpdating, 3))
+
+    def stats(self):
+        return {'free': len(self.free), 'created': self.created, 'reused': self.reused}
+
+obstacle_pool = ObstaclePool()
+
+def create_obstacle(group, width = None, rng = None):
+    """
+    Returns a python with a random strategy, height and velocity. The python is taken from obstacle_pool if one was released.
+    The default width is the width of the screen. It is read when the function is called, not when this module is imported.
+    The random numbers are drawn from rng, which is Settings.rng unless another one is given.
+    """
+    if width is None:
+        width = Settings.get_settings().width_screen
+    if rng is None:
+        rng = Settings.get_settings().rng
+    return obstacle_pool.acquire(group, width, rng)
 
 if __name__ == "__main__":    
     game = Settings.get_settings()
@@ -437,7 +671,7 @@ if __name__ == "__main__":
     chick.rescale_percentage(0.91)
 
     for _ in range(5):
-        create_obstacle(width=random.randint(600, 1120), group=obstaclesprites)
+        create_obstacle(width=game.rng.randint(600, 1120), group=obstaclesprites)
 
     score = TextSprite(name_image = f'Score {game.score}', 
                         location_x = 0, 
@@ -491,15 +725,16 @@ if __name__ == "__main__":
         # Track the deleted sprites
         #deleted_sprites = [enemy for enemy in obstaclesprites if enemy not in collision_obstacles]
 
-        score.name_image = f'Score: {game.score}'
+        score.set_text(f'Score: {game.score}')
 
         if collision_obstacles:
             #print("Player collided with an enemy!")
             create_obstacle(group=obstaclesprites)
             chick.health -= 1
-            health.name_image = f'Health: {chick.health}'
-            health.image = health.font.render(health.name_image, False, 'black')
+            health.set_text(f'Health: {chick.health}')
         
+        game.scheduler.tick()
+
         #if chick.health == 0:
             #running = False
             #game.update_csv()
@@ -10,6 +10,55 @@ Creator: John Francis Y. Viray and Rohan A. Sachdev
 # Importing modules 
 import pygame
 from Settings import Settings
+from AssetCache import AssetCache, FontRegistry, FONT_PATH
+
+class GlyphCache():
+    """
+    GlyphCache is for texts that change often and end in a number, such as 'Score: N'. The text before the number is rendered
+    by the font only once, and the digits are made from cached glyphs instead of rasterising the whole string again.
+    Every digit is put where the font would put it, so the text looks the same as font.render() with its kerning and advances.
+
+    Attributes:
+        glyphs (dict): The rendered digits. The key is (font, color, digit).
+        prefixes (dict): The rendered texts before the numbers. The key is (font, color, prefix).
+
+    Methods:
+        render(font, text, color): Returns a Surface of the text that is made from the cached prefix and digits.
+    """
+    def __init__(self):
+        self.glyphs = {}
+        self.prefixes = {}
+
+    def get_glyph(self, font, character, color):
+        key = (font, color, character)
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            glyph = font.render(character, False, color)
+            self.glyphs[key] = glyph
+        return glyph
+
+    def get_prefix(self, font, prefix, color):
+        key = (font, color, prefix)
+        surface = self.prefixes.get(key)
+        if surface is None:
+            surface = font.render(prefix, False, color)
+            self.prefixes[key] = surface
+        return surface
+
+    def render(self, font, text, color):
+        prefix = text.rstrip('0123456789')
+        surface = pygame.Surface(font.size(text), pygame.SRCALPHA)
+        if prefix:
+            surface.blit(self.get_prefix(font, prefix, color), (0, 0))
+
+        # The advances of the font are not whole pixels, so every digit is put where the text up to it ends,
+        # which font.size() gives without rendering anything
+        for position in range(len(prefix), len(text)):
+            glyph = self.get_glyph(font, text[position], color)
+            surface.blit(glyph, (font.size(text[:position + 1])[0] - glyph.get_width(), 0))
+        return surface
+
+glyph_cache = GlyphCache()
         
 class TextSprite(pygame.sprite.Sprite):
     """
@@ -31,27 +80,44 @@ class TextSprite(pygame.sprite.Sprite):
         blit_text_middle(self): Displays the text in the middle but the location in the y-axis is dependent on the parameter
         blit_text(self): Displays the text in any location
         update(): The text sprites will not move, so the method is just passing.
+        set_text(text): Changes the text. The font only renders it again if the text is different.
     """
     #game = Settings.get_settings
-    def __init__(self, name_image, location_x, location_y, groups):
+    def __init__(self, name_image, location_x, location_y, groups, use_glyph_cache = False):
         """
         Constructor creates the TextSprite objects based on the text.
+        If use_glyph_cache is True, the text is made from cached glyphs instead of being rendered by the font.
         """
 
         # Initialize the text, location, font, and surface
         super().__init__(groups)
-        pygame.font.init()
 
         self.name_image = name_image
         self.location_x = location_x
         self.location_y = location_y
-        self.font = pygame.font.Font('/Users/jfv/Desktop/Python Marathon/Graphics/Pokemon_GB.ttf', 30)
-        self.image = self.font.render(self.name_image, False, 'black')
+        self.font = FontRegistry.get_registry().get_font(FONT_PATH, 30)
+        self.use_glyph_cache = use_glyph_cache
+        self.render_text()
         
         # Get the rectangle
-        self.rect = self.image.get_rect(topleft = (self.location_x, self.location_y))
         self.background_rect = pygame.Rect(self.location_x, self.location_y, self.image.get_width(), self.image.get_height())
 
+    def render_text(self):
+        """
+        render_text() is a helper method that renders name_image into the image and remembers which text was rendered.
+        """
+        if self.use_glyph_cache:
+            self.image = glyph_cache.render(self.font, self.name_image, 'black')
+        else:
+            self.image = self.font.render(self.name_image, False, 'black')
+        self.rendered_text = self.name_image
+        self.rect = self.image.get_rect(topleft = (self.location_x, self.location_y))
+
+    def set_text(self, text):
+        self.name_image = text
+        if self.name_image != self.rendered_text:
+            self.render_text()
+
     def update(self):
         self.rect.topleft
         self.image
@@ -65,8 +131,10 @@ class TextSpriteWhite(TextSprite):
     def update(self):
         pygame.draw.rect(Settings.get_settings().screen, (255, 255, 255, 0), [self.location_x, self.location_y, self.rect.width, self.rect.height])
         Settings.get_settings().screen.blit(self.image, self.rect)
-        self.image = self.font.render(self.name_image, False, 'black')
-        self.rect = self.image.get_rect(topleft = (self.location_x, self.location_y))
+
+        # The font is only used again if name_image was changed since the last render
+        if self.name_image != self.rendered_text:
+            self.render_text()
 
 class ButtonSprite(pygame.sprite.Sprite):
     def __init__(self, name_image, location_x, location_y, groups):
@@ -74,7 +142,7 @@ class ButtonSprite(pygame.sprite.Sprite):
         self.name_image = name_image
         self.location_x = location_x
         self.location_y = location_y
-        self.image = pygame.image.load(f'/Users/jfv/Desktop/Serpent Sprint/Graphics/Button/{name_image}.png')
+        self.image = AssetCache.get_cache().get_image(f'/Users/jfv/Desktop/Serpent Sprint/Graphics/Button/{name_image}.png')
         self.rect = self.image.get_rect(topleft = (self.location_x, self.location_y))
 
     def update(self):
@@ -88,6 +156,14 @@ if __name__ == "__main__":
     import sys
     game = Settings.get_settings()
     game.start_game()
+
+    # The texts made from the glyph cache have to look exactly like the ones the font renders
+    font = FontRegistry.get_registry().get_font(FONT_PATH, 30)
+    for text in ['Health: 2', 'Health: 10', 'Score: 0', 'Score: 123', 'Score: 4711']:
+        rendered = pygame.mask.from_surface(font.render(text, False, 'black'))
+        cached = pygame.mask.from_surface(glyph_cache.render(font, text, 'black'))
+        is_same = rendered.get_size() == cached.get_size() and rendered.count() == cached.count() == rendered.overlap_area(cached, (0, 0))
+        print(f"{text}: same as font.render: {is_same}")
     
     obstaclesprites = pygame.sprite.Group()
     separatesprites = pygame.sprite.Group()
@@ -143,3 +219,4 @@ if __name__ == "__main__":
         separatesprites.draw(game.screen)
         separatesprites.update()
         pygame.display.flip()
+        game.scheduler.tick()